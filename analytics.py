@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+from scipy.ndimage import label
+from model import GameModel, seeded_mine_positions
+from neighbors import count_neighbors
+from batch import BATCH_CONNECTIVITY, dilate
+from solver import DIFFICULTIES, play_game
+
+# Seeds scored per worker task, enough to vectorize the metrics and amortize sending results back
+TASK_SEEDS = 2000
+# Tasks queued per worker; finished results wait in memory only until everything before them is on disk
+TASKS_PER_WORKER = 2
+META_FILE = "meta.json"
+
+BOARD_COLUMNS = {
+    "seed": np.uint64,
+    "bbbv": np.uint32,
+    "openings": np.uint32,
+    "largest_opening": np.uint32,
+    "isolated": np.uint32,
+}
+SOLVER_COLUMNS = {
+    "won": np.bool_,
+    "guesses": np.uint32,
+}
+
+def board_metrics(boards):
+    """Return 3BV, opening count, largest opening and isolated number count for a (boards, rows, cols) array of board values."""
+    num_boards = len(boards)
+    zeros = boards == 0
+    labels, _ = label(zeros, structure=BATCH_CONNECTIVITY)
+    # Labels are numbered in scan order and never span boards, so each board owns a contiguous run of them
+    last_label = np.maximum.accumulate(labels.reshape(num_boards, -1).max(axis=1))
+    openings = np.diff(last_label, prepend=0)
+    sizes = np.bincount(labels.ravel())[1:]
+    largest = np.zeros(num_boards, dtype=np.int64)
+    np.maximum.at(largest, np.repeat(np.arange(num_boards), openings), sizes)
+    
+    # Numbers outside every opening and its border each need a click of their own
+    isolated = np.count_nonzero((boards > 0) & ~dilate(zeros), axis=(1, 2))
+    return openings + isolated, openings, largest, isolated
+
+def score_seeds(board_shape, num_mines, start, first_seed, count, solve=True):
+    """Score the boards of count consecutive seeds from first_seed, returning one array per column."""
+    seeds = np.arange(first_seed, first_seed + count, dtype=np.uint64)
+    mines = np.zeros((count, board_shape[0] * board_shape[1]), dtype=bool)
+    won = np.zeros(count, dtype=bool)
+    guesses = np.zeros(count, dtype=np.uint32)
+    model = GameModel(board_shape, num_mines)
+    for i, seed in enumerate(seeds.tolist()):
+        # Mines go down around the first click, so a board is identified by its seed and start cell
+        mines[i, seeded_mine_positions(board_shape, num_mines, seed, *start)] = True
+        if solve:
+            # The solver's first reveal places the same mines from the seed
+            model.restart(seed)
+            won[i], guesses[i] = play_game(model, start)
+    
+    # board_metrics labels the openings of the whole batch at once, so the values are all that is needed here
+    mines = mines.reshape(count, *board_shape)
+    boards = np.where(mines, np.int8(-1), count_neighbors(mines))
+    bbbv, openings, largest, isolated = board_metrics(boards)
+    columns = {"seed": seeds, "bbbv": bbbv, "openings": openings, "largest_opening": largest, "isolated": isolated}
+    if solve:
+        columns.update(won=won, guesses=guesses)
+    return columns
+
+class ColumnWriter:
+    def __init__(self, directory, columns, meta):
+        """Stream rows into one raw little-endian .bin file per column, described by a meta.json written on close."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = {name: np.dtype(dtype).newbyteorder("<") for name, dtype in columns.items()}
+        self.meta = meta
+        self.rows = 0
+        self.files = {name: open(os.path.join(directory, name + ".bin"), "wb") for name in self.columns}
+    
+    def write(self, chunk):
+        """Append a dict of equal-length column arrays."""
+        for name, dtype in self.columns.items():
+            self.files[name].write(np.asarray(chunk[name], dtype=dtype).tobytes())
+        self.rows += len(chunk["seed"])
+    
+    def close(self):
+        """Close the column files and record the row count and dtypes in meta.json."""
+        for stream in self.files.values():
+            stream.close()
+        meta = dict(self.meta, rows=self.rows, columns={name: dtype.str for name, dtype in self.columns.items()})
+        with open(os.path.join(self.directory, META_FILE), "w") as stream:
+            json.dump(meta, stream, indent=2)
+
+def read_columns(directory):
+    """Return the metadata and a memory-mapped array per column of a scored corpus."""
+    with open(os.path.join(directory, META_FILE)) as stream:
+        meta = json.load(stream)
+    columns = {}
+    for name, dtype in meta["columns"].items():
+        path = os.path.join(directory, name + ".bin")
+        # An empty file cannot be memory-mapped
+        columns[name] = np.memmap(path, dtype=dtype, mode="r") if meta["rows"] else np.empty(0, dtype=dtype)
+    return meta, columns
+
+def score_corpus(directory, board_shape, num_mines, first_seed, count, start=None, solve=True, workers=None,
+                 task_seeds=TASK_SEEDS):
+    """Score count consecutive seeds across worker processes, streaming the columns to directory in seed order."""
+    board_shape = tuple(board_shape)
+    start = tuple(start) if start else (board_shape[0] // 2, board_shape[1] // 2)
+    workers = workers or os.cpu_count() or 1
+    columns = dict(BOARD_COLUMNS, **(SOLVER_COLUMNS if solve else {}))
+    meta = {"board_shape": board_shape, "num_mines": num_mines, "start": start, "first_seed": first_seed}
+    writer = ColumnWriter(directory, columns, meta)
+    try:
+        # Spawned workers start clean instead of inheriting the parent's state
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as executor:
+            pending = deque()
+            for task_first in range(first_seed, first_seed + count, task_seeds):
+                task_count = min(task_seeds, first_seed + count - task_first)
+                pending.append(executor.submit(score_seeds, board_shape, num_mines, start, task_first, task_count, solve))
+                if len(pending) >= workers * TASKS_PER_WORKER:
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+    finally:
+        writer.close()
+    return writer.rows
+
+def main():
+    """Score a seed corpus from the command line."""
+    parser = argparse.ArgumentParser(description="Rate Minesweeper boards by 3BV, openings and solver effort.")
+    parser.add_argument("output", help="directory for the column files and meta.json")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="expert")
+    parser.add_argument("--rows", type=int, help="board rows (overrides the difficulty)")
+    parser.add_argument("--cols", type=int, help="board columns (overrides the difficulty)")
+    parser.add_argument("--mines", type=int, help="mine count (overrides the difficulty)")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=100_000, help="consecutive seeds to score")
+    parser.add_argument("--start", type=int, nargs=2, metavar=("ROW", "COL"), help="first click (default: the center)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--no-solver", action="store_true", help="skip the won and guesses columns")
+    args = parser.parse_args()
+    
+    (rows, cols), mines = DIFFICULTIES[args.difficulty]
+    board_shape = (args.rows or rows, args.cols or cols)
+    num_mines = args.mines if args.mines is not None else mines
+    began = time.perf_counter()
+    scored = score_corpus(args.output, board_shape, num_mines, args.first_seed, args.count, args.start,
+                          not args.no_solver, args.workers)
+    elapsed = time.perf_counter() - began
+    
+    _, columns = read_columns(args.output)
+    print(f"{scored} boards in {elapsed:.1f} s ({scored / elapsed:.0f} boards/s)")
+    if scored:
+        print(f"3BV mean {columns['bbbv'].mean():.1f}, openings mean {columns['openings'].mean():.2f}, "
+              f"isolated mean {columns['isolated'].mean():.1f}")
+        if "won" in columns:
+            print(f"solved {columns['won'].mean():.1%}, guesses mean {columns['guesses'].mean():.2f}")
+
+if __name__ == "__main__":
+    main()
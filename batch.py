@@ -0,0 +1,229 @@
+import numpy as np
+from scipy.ndimage import label
+from neighbors import NEIGHBOR_OFFSETS, count_neighbors, neighbor_table
+
+# Connect cells within a board but never across the batch axis
+BATCH_CONNECTIVITY = np.zeros((3, 3, 3), dtype=bool)
+BATCH_CONNECTIVITY[1] = True
+
+GENERATE_BLOCK = 4096
+
+PLAYING = 0
+WON = 1
+LOST = 2
+
+def place_mines(rng, num_boards, board_shape, num_mines, exclude=None):
+    """Return a (num_boards, rows, cols) bool array with num_mines mines placed uniformly on each board, avoiding exclude."""
+    size = board_shape[0] * board_shape[1]
+    if num_mines == 0:
+        return np.zeros((num_boards, *board_shape), dtype=bool)
+    if num_mines >= size:
+        return np.ones((num_boards, *board_shape), dtype=bool)
+    
+    keys = rng.random((num_boards, size))
+    if exclude is not None:
+        # Keys are below 1, so excluded cells sort after every allowed one
+        keys[exclude.reshape(num_boards, size)] = 2.0
+    # The num_mines smallest keys of each row form a uniform sample without replacement
+    threshold = np.partition(keys, num_mines - 1, axis=1)[:, num_mines - 1:num_mines]
+    mines = keys <= threshold
+    tied = np.flatnonzero(mines.sum(axis=1) != num_mines)
+    for b in tied:
+        mines[b] = False
+        mines[b, rng.choice(np.flatnonzero(keys[b] < 2.0), num_mines, replace=False)] = True
+    return mines.reshape(num_boards, *board_shape)
+
+def dilate(mask):
+    """Grow a (boards, rows, cols) mask by one cell in all 8 directions within each board."""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2, mask.shape[2] + 2), dtype=bool)
+    padded[:, 1:-1, 1:-1] = mask
+    rows = padded[:, :, :-2] | padded[:, :, 1:-1] | padded[:, :, 2:]
+    return rows[:, :-2] | rows[:, 1:-1] | rows[:, 2:]
+
+class BatchModel:
+    def __init__(self, num_boards, board_shape=(16, 16), num_mines=40, seed=None, safe_first_click=False):
+        """Initialize a batch of independent games, optionally placing each board's mines clear of its first reveal."""
+        self.num_boards = num_boards
+        self.board_shape = board_shape
+        self.num_mines = num_mines
+        self.neighbors = neighbor_table(board_shape)
+        self.rng = np.random.default_rng(seed)
+        self.safe_first_click = safe_first_click
+        
+        self.board = None
+        self.placed = None
+        self.user_board = None
+        self.flag_board = None
+        self.zero_labels = None
+        self.hidden_count = None
+        self.game_over = None
+        self.game_won = None
+        self.game_started = None
+        
+        self.generate_boards()
+    
+    def generate_boards(self):
+        """Generate a fresh board for every game in the batch."""
+        shape = (self.num_boards, *self.board_shape)
+        self.board = np.zeros(shape, dtype=np.int8)
+        # With safe_first_click the mines of each board wait for its first reveal
+        self.placed = np.zeros(self.num_boards, dtype=bool)
+        if not self.safe_first_click:
+            for start in range(0, self.num_boards, GENERATE_BLOCK):
+                stop = min(start + GENERATE_BLOCK, self.num_boards)
+                mines = place_mines(self.rng, stop - start, self.board_shape, self.num_mines)
+                self.board[start:stop] = np.where(mines, np.int8(-1), count_neighbors(mines))
+            self.placed[:] = True
+        
+        self.user_board = np.full(shape, -2, dtype=np.int8)
+        self.flag_board = np.zeros(shape, dtype=bool)
+        self.zero_labels = None
+        self.hidden_count = np.full(self.num_boards, self.board_shape[0] * self.board_shape[1], dtype=np.int64)
+        self.game_over = np.zeros(self.num_boards, dtype=bool)
+        self.game_won = np.zeros(self.num_boards, dtype=bool)
+        self.game_started = np.zeros(self.num_boards, dtype=bool)
+    
+    def status(self):
+        """Return PLAYING, WON or LOST for every board."""
+        status = np.full(self.num_boards, PLAYING, dtype=np.int8)
+        status[self.game_over] = LOST
+        status[self.game_won] = WON
+        return status
+    
+    def reveal(self, boards, rows, cols):
+        """Reveal one cell per action on boards still in play, like GameModel.reveal_cell."""
+        return self.apply(self.reveal_cells, boards, rows, cols)
+    
+    def toggle_flag(self, boards, rows, cols):
+        """Toggle a flag per action on boards still in play, like GameModel.toggle_flag."""
+        return self.apply(self.toggle_flags, boards, rows, cols)
+    
+    def chord(self, boards, rows, cols):
+        """Chord one cell per action on boards still in play, like GameModel.chord_cell."""
+        return self.apply(self.chord_cells, boards, rows, cols)
+    
+    def apply(self, action, boards, rows, cols):
+        """Run an action on boards that are not over, in the order given, and return which actions took effect."""
+        # Finished boards are skipped the same way GameController ignores grid clicks after game over
+        boards = np.asarray(boards, dtype=np.intp)
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        applied = np.zeros(len(boards), dtype=bool)
+        pending = np.arange(len(boards))
+        
+        while len(pending):
+            # Take the earliest pending action of each board so every step touches a board once
+            _, first = np.unique(boards[pending], return_index=True)
+            step = pending[np.sort(first)]
+            pending = np.setdiff1d(pending, step, assume_unique=True)
+            
+            live = step[~self.game_over[boards[step]]]
+            applied[live] = action(boards[live], rows[live], cols[live])
+        return applied
+    
+    def in_bounds(self, rows, cols):
+        """Return which positions lie on the board."""
+        return (rows >= 0) & (rows < self.board_shape[0]) & (cols >= 0) & (cols < self.board_shape[1])
+    
+    def reveal_cells(self, boards, rows, cols):
+        """Reveal at most one cell per board, flooding empty regions and updating win/loss."""
+        revealed = np.zeros(len(boards), dtype=bool)
+        inside = np.flatnonzero(self.in_bounds(rows, cols))
+        hit = inside[(self.user_board[boards[inside], rows[inside], cols[inside]] == -2)
+                     & ~self.flag_board[boards[inside], rows[inside], cols[inside]]]
+        revealed[hit] = True
+        b, r, c = boards[hit], rows[hit], cols[hit]
+        if len(b) == 0:
+            return revealed
+        
+        fresh = ~self.placed[b]
+        if fresh.any():
+            self.place_around(b[fresh], r[fresh], c[fresh])
+        self.game_started[b] = True
+        values = self.board[b, r, c]
+        self.user_board[b, r, c] = values
+        self.hidden_count[b] -= 1
+        self.game_over[b[values == -1]] = True
+        
+        empty = values == 0
+        if empty.any():
+            self.flood_fill(b[empty], r[empty], c[empty])
+        
+        won = b[~self.game_over[b] & (self.hidden_count[b] == self.num_mines)]
+        self.game_won[won] = True
+        self.game_over[won] = True
+        return revealed
+    
+    def place_around(self, boards, rows, cols):
+        """Place the mines of boards still without them, keeping each first revealed cell and its neighbors clear."""
+        size = self.board_shape[0] * self.board_shape[1]
+        clicked = np.zeros((len(boards), *self.board_shape), dtype=bool)
+        index = np.arange(len(boards))
+        clicked[index, rows, cols] = True
+        exclude = dilate(clicked)
+        # Fall back to clearing only the clicked cell, then nothing, on boards too full for the whole neighborhood
+        crowded = size - exclude.sum(axis=(1, 2)) < self.num_mines
+        exclude[crowded] = clicked[crowded]
+        if size - 1 < self.num_mines:
+            exclude[:] = False
+        
+        for start in range(0, len(boards), GENERATE_BLOCK):
+            block = slice(start, start + GENERATE_BLOCK)
+            mines = place_mines(self.rng, len(boards[block]), self.board_shape, self.num_mines, exclude[block])
+            self.board[boards[block]] = np.where(mines, np.int8(-1), count_neighbors(mines))
+        self.placed[boards] = True
+        self.zero_labels = None
+    
+    def flood_fill(self, boards, rows, cols):
+        """Reveal the empty regions containing the given cells, one cell per board."""
+        if self.zero_labels is None:
+            self.zero_labels, _ = label(self.board == 0, structure=BATCH_CONNECTIVITY)
+        
+        region_ids = self.zero_labels[boards, rows, cols]
+        user = self.user_board[boards]
+        hidden = (user == -2) & ~self.flag_board[boards]
+        
+        region = self.zero_labels[boards] == region_ids[:, None, None]
+        seeds = np.zeros_like(region)
+        seeds[np.arange(len(boards)), rows, cols] = True
+        blocked = (region & ~hidden & ~seeds).any(axis=(1, 2))
+        if blocked.any():
+            # Flags or earlier reveals split these regions, so only the part reachable from the seed opens
+            reachable = (region[blocked] & hidden[blocked]) | seeds[blocked]
+            parts, _ = label(reachable, structure=BATCH_CONNECTIVITY)
+            seed_parts = parts[seeds[blocked]]
+            region[blocked] = parts == seed_parts[:, None, None]
+        
+        reveal = dilate(region) & hidden
+        self.user_board[boards] = np.where(reveal, self.board[boards], user)
+        self.hidden_count[boards] -= reveal.sum(axis=(1, 2))
+    
+    def toggle_flags(self, boards, rows, cols):
+        """Toggle a flag on hidden cells, one cell per board."""
+        inside = np.flatnonzero(self.in_bounds(rows, cols))
+        hit = inside[self.user_board[boards[inside], rows[inside], cols[inside]] == -2]
+        self.flag_board[boards[hit], rows[hit], cols[hit]] ^= True
+        toggled = np.zeros(len(boards), dtype=bool)
+        toggled[hit] = True
+        return toggled
+    
+    def chord_cells(self, boards, rows, cols):
+        """Reveal the unflagged neighbors of numbered cells whose flag count matches, one cell per board."""
+        inside = np.flatnonzero(self.in_bounds(rows, cols))
+        b, r, c = boards[inside], rows[inside], cols[inside]
+        values = self.user_board[b, r, c]
+        
+        flag_count = self.neighbors.count(self.flag_board, r, c, b)
+        
+        chorded = (values > 0) & (flag_count == values)
+        b, r, c = b[chorded], r[chorded], c[chorded]
+        # Reveal neighbors one direction at a time in GameModel.get_neighbors order,
+        # so a mine and a winning reveal in the same chord resolve exactly as they do there
+        for dr, dc in NEIGHBOR_OFFSETS:
+            nr, nc = r + dr, c + dc
+            ok = self.in_bounds(nr, nc)
+            self.reveal_cells(b[ok], nr[ok], nc[ok])
+        
+        result = np.zeros(len(boards), dtype=bool)
+        result[inside[chorded]] = True
+        return result
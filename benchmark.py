@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+
+# Render through SDL's dummy driver so the suite runs without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as g
+from model import GameModel
+from view import GameView
+
+SIZES = [(8, 8), (16, 16), (100, 100), (500, 500), (2000, 2000)]
+MINE_DENSITY = 0.15
+# Sparse boards give the single large opening that reveal_cell and flood_fill are timed on
+OPENING_DENSITY = 0.02
+CHORD_CELLS = 200
+CHECK_WIN_CALLS = 1000
+WINDOW_SIZE = (1280, 800)
+DEFAULT_TOLERANCE = 0.25
+
+def make_model(board_shape, density, seed):
+    """Create a model with its mines placed from the given seed around a first click in the middle."""
+    num_mines = max(1, int(board_shape[0] * board_shape[1] * density))
+    model = GameModel(board_shape, num_mines, seed=seed)
+    model.place_mines(board_shape[0] // 2, board_shape[1] // 2)
+    return model
+
+def largest_opening(model):
+    """Return a cell in the largest empty region of the model's board."""
+    sizes = np.bincount(model.zero_labels.ravel())
+    sizes[0] = 0
+    row, col = np.argwhere(model.zero_labels == sizes.argmax())[0]
+    return int(row), int(col)
+
+def make_view(model):
+    """Create a view of the model in a window of WINDOW_SIZE on the dummy display."""
+    screen = g.display.set_mode(WINDOW_SIZE)
+    view = GameView(screen, model)
+    view.update_dimensions(*WINDOW_SIZE)
+    view.render()
+    return view
+
+def measure(setup, action, repeat):
+    """Time action(state) on a fresh state from setup() repeat times, returning milliseconds per run."""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        action(state)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def bench_generate_board(board_shape, seed, repeat):
+    """Time starting a new game and placing its mines on the first click."""
+    model = make_model(board_shape, MINE_DENSITY, seed)
+    
+    def generate(_):
+        model.generate_board(seed=seed)
+        model.place_mines(board_shape[0] // 2, board_shape[1] // 2)
+    return measure(lambda: None, generate, repeat), 1
+
+def bench_reveal_opening(board_shape, seed, repeat):
+    """Time revealing a cell of the largest empty region on a fresh board."""
+    model = make_model(board_shape, OPENING_DENSITY, seed)
+    row, col = largest_opening(model)
+    initial = model.snapshot()
+    return measure(lambda: model.restore(initial), lambda _: model.reveal_cell(row, col), repeat), 1
+
+def bench_flood_fill(board_shape, seed, repeat):
+    """Time flood-filling the largest empty region on a fresh board."""
+    model = make_model(board_shape, OPENING_DENSITY, seed)
+    row, col = largest_opening(model)
+    initial = model.snapshot()
+    return measure(lambda: model.restore(initial), lambda _: model.flood_fill(row, col), repeat), 1
+
+def bench_chord_cell(board_shape, seed, repeat):
+    """Time chording revealed numbered cells whose mines are all flagged."""
+    model = make_model(board_shape, MINE_DENSITY, seed)
+    for row, col in np.argwhere(model.board == -1):
+        model.toggle_flag(row, col)
+    rng = np.random.default_rng(seed)
+    numbered = np.argwhere(model.board > 0)
+    cells = numbered[rng.choice(len(numbered), min(CHORD_CELLS, len(numbered)), replace=False)]
+    for row, col in cells:
+        model.reveal_cell(row, col)
+    prepared = model.snapshot()
+    
+    def chord_all(_):
+        for row, col in cells:
+            model.chord_cell(row, col)
+    return measure(lambda: model.restore(prepared), chord_all, repeat), len(cells)
+
+def bench_check_win(board_shape, seed, repeat):
+    """Time repeated win checks on a board in play."""
+    model = make_model(board_shape, MINE_DENSITY, seed)
+    
+    def check(_):
+        for _ in range(CHECK_WIN_CALLS):
+            model.check_win()
+    return measure(lambda: None, check, repeat), CHECK_WIN_CALLS
+
+def bench_render_full(board_shape, seed, repeat):
+    """Time a full redraw of the view."""
+    model = make_model(board_shape, MINE_DENSITY, seed)
+    view = make_view(model)
+    
+    def setup():
+        view.full_redraw = True
+    return measure(setup, lambda _: view.render(), repeat), 1
+
+def bench_render_update(board_shape, seed, repeat):
+    """Time the incremental redraw after opening the largest visible empty region."""
+    model = make_model(board_shape, OPENING_DENSITY, seed)
+    view = make_view(model)
+    labels = model.zero_labels[view.visible_slices()]
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    row, col = np.argwhere(labels == sizes.argmax())[0] if sizes.any() else (0, 0)
+    initial = model.snapshot()
+    
+    def setup():
+        model.restore(initial)
+        view.render()
+        model.reveal_cell(int(row), int(col))
+    return measure(setup, lambda _: view.render(), repeat), 1
+
+CASES = {
+    "generate_board": bench_generate_board,
+    "reveal_opening": bench_reveal_opening,
+    "flood_fill": bench_flood_fill,
+    "chord_cell": bench_chord_cell,
+    "check_win": bench_check_win,
+    "render_full": bench_render_full,
+    "render_update": bench_render_update,
+}
+
+def run_benchmarks(cases=tuple(CASES), sizes=SIZES, seed=0, repeat=5):
+    """Run every case on every board size and return the results as a JSON-ready dict."""
+    g.init()
+    results = []
+    for name in cases:
+        for board_shape in sizes:
+            times, ops = CASES[name](board_shape, seed, repeat)
+            results.append({
+                "case": name,
+                "size": f"{board_shape[0]}x{board_shape[1]}",
+                "ops": ops,
+                "median_ms": statistics.median(times),
+                "min_ms": min(times),
+                "max_ms": max(times),
+            })
+    g.quit()
+    return {
+        "meta": {
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": g.version.ver,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return (case, size, baseline ms, current ms) for results whose median slowed by more than tolerance."""
+    previous = {(row["case"], row["size"]): row["median_ms"] for row in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        before = previous.get((row["case"], row["size"]))
+        if before is not None and row["median_ms"] > before * (1 + tolerance):
+            regressions.append((row["case"], row["size"], before, row["median_ms"]))
+    return regressions
+
+def parse_size(text):
+    """Parse a ROWSxCOLS board size."""
+    rows, _, cols = text.lower().partition("x")
+    return int(rows), int(cols)
+
+def main():
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper model and headless rendering.")
+    parser.add_argument("--seed", type=int, default=0, help="seed for board generation")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case and size")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, metavar="ROWSxCOLS",
+                        help="board sizes (default: " + " ".join(f"{r}x{c}" for r, c in SIZES) + ")")
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored JSON result")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown of the median before a case counts as a regression")
+    parser.add_argument("cases", nargs="*", help=f"any of {', '.join(CASES)} (default: all)")
+    args = parser.parse_args()
+    for name in args.cases:
+        if name not in CASES:
+            parser.error(f"unknown case {name!r}")
+    
+    report = run_benchmarks(args.cases or tuple(CASES), args.sizes or SIZES, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2)
+    
+    print(f"{'case':<16}{'size':>11}{'ops':>6}{'median ms':>12}{'min ms':>10}")
+    for row in report["results"]:
+        print(f"{row['case']:<16}{row['size']:>11}{row['ops']:>6}{row['median_ms']:>12.3f}{row['min_ms']:>10.3f}")
+    
+    if args.compare:
+        with open(args.compare) as stream:
+            regressions = compare(report, json.load(stream), args.tolerance)
+        for case, size, before, after in regressions:
+            print(f"REGRESSION {case} {size}: {before:.3f} ms -> {after:.3f} ms ({after / before - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import get_context
+import numpy as np
+from model import GameModel
+from solver import play_game
+
+POOL_CAPACITY = 4
+# Layouts tried per no-guess board before the worker gives up and the slot is refilled
+NO_GUESS_ATTEMPTS = 2000
+
+class PooledBoard:
+    def __init__(self, mine_positions, start):
+        """Hold a pre-generated mine layout and the safe first click it is solvable from."""
+        self.mine_positions = mine_positions
+        self.start = start
+
+def make_board(board_shape, num_mines, seed):
+    """Generate one no-guess board by rejection sampling until the solver finishes it without guessing."""
+    rng = np.random.default_rng(seed)
+    for _ in range(NO_GUESS_ATTEMPTS):
+        # Placing the mines around a first click, as a live game does, keeps an opening at the start cell
+        start = (int(rng.integers(board_shape[0])), int(rng.integers(board_shape[1])))
+        model = GameModel(board_shape, num_mines, seed=int(rng.integers(2 ** 63)))
+        model.place_mines(*start)
+        mine_positions = np.flatnonzero(model.board == -1)
+        won, _ = play_game(model, start, max_guesses=0)
+        if won:
+            return PooledBoard(mine_positions, start)
+    return None
+
+class BoardPool:
+    def __init__(self, capacity=POOL_CAPACITY, workers=None):
+        """Pre-generate no-guess boards in worker processes, keeping up to capacity ready per board configuration."""
+        self.capacity = capacity
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.executor = None
+        self.seeds = np.random.SeedSequence()
+        self.ready = {}
+        self.pending = {}
+    
+    def fill(self, board_shape, num_mines):
+        """Queue background generation until the configuration has capacity boards ready or in progress."""
+        config = (tuple(board_shape), num_mines)
+        self.collect(config)
+        ready = self.ready[config]
+        pending = self.pending[config]
+        if self.executor is None:
+            # Spawned workers start clean instead of inheriting the parent's SDL state
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        while len(ready) + len(pending) < self.capacity:
+            pending.add(self.executor.submit(make_board, *config, self.seeds.spawn(1)[0]))
+    
+    def collect(self, config):
+        """Move the finished boards of a configuration into its ready queue."""
+        ready = self.ready.setdefault(config, deque())
+        pending = self.pending.setdefault(config, set())
+        for future in [future for future in pending if future.done()]:
+            pending.discard(future)
+            if not future.cancelled() and future.exception() is None and future.result() is not None:
+                ready.append(future.result())
+    
+    def take(self, board_shape, num_mines, timeout=0):
+        """Return a ready board, waiting up to timeout seconds (None waits for one), or None if there is none yet."""
+        config = (tuple(board_shape), num_mines)
+        self.fill(*config)
+        ready = self.ready[config]
+        pending = self.pending[config]
+        while not ready and pending and (timeout is None or timeout > 0):
+            wait(pending, timeout, return_when=FIRST_COMPLETED)
+            self.collect(config)
+            if timeout is not None:
+                break
+        
+        board = ready.popleft() if ready else None
+        self.fill(*config)
+        return board
+    
+    def close(self):
+        """Stop the workers, dropping any boards still being generated."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,353 @@
+import numpy as np
+import time
+from neighbors import neighbor_table
+
+CHUNK_SIZE = 64
+CONNECTIVITY = np.ones((3, 3), dtype=bool)
+# numpy's hypergeometric samplers only accept populations below this many cells
+HYPERGEOMETRIC_LIMIT = 10**9
+
+def dilate(mask):
+    """Grow a 2D mask by one cell in all 8 directions, keeping its shape."""
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1] + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    rows = padded[:, :-2] | padded[:, 1:-1] | padded[:, 2:]
+    return rows[:-2] | rows[1:-1] | rows[2:]
+
+def split_mines(rng, sizes, num_mines):
+    """Split mines between blocks of the given sizes the way a uniform layout over all of them would."""
+    total = int(sizes.sum())
+    if total < HYPERGEOMETRIC_LIMIT:
+        # An exact multivariate hypergeometric split keeps the layout uniform over the whole board
+        return rng.multivariate_hypergeometric(sizes, num_mines, method="marginals")
+    
+    # Larger boards are halved until each part fits, drawing the first half's share from a normal with the
+    # hypergeometric mean and variance, which is indistinguishable at these sizes
+    half = len(sizes) // 2
+    first = int(sizes[:half].sum())
+    mean = num_mines * first / total
+    variance = mean * (total - first) / total * (total - num_mines) / (total - 1)
+    share = int(np.clip(np.rint(rng.normal(mean, np.sqrt(variance))), max(0, num_mines - (total - first)), min(num_mines, first)))
+    return np.concatenate([split_mines(rng, sizes[:half], share), split_mines(rng, sizes[half:], num_mines - share)])
+
+class Chunk:
+    def __init__(self, board):
+        """Hold the materialized state of one chunk of a large board."""
+        self.board = board
+        self.user = np.full(board.shape, -2, dtype=np.int8)
+        self.flags = np.zeros(board.shape, dtype=bool)
+
+class ChunkedLayer:
+    def __init__(self, model, layer):
+        """Expose one layer ("board", "user" or "flags") of a chunked model with array-style indexing."""
+        self.model = model
+        self.layer = layer
+        self.shape = model.board_shape
+    
+    def __getitem__(self, key):
+        """Return a single cell for [row, col] or a dense copy for [row_slice, col_slice]."""
+        row, col = key
+        if isinstance(row, slice) or isinstance(col, slice):
+            return self.model.window(self.layer, row, col)
+        return self.model.cell(self.layer, row, col)
+
+class ChunkedGameModel:
+    def __init__(self, board_shape=(10000, 10000), num_mines=15000000, seed=None):
+        """Initialize a large-board game whose cells are only materialized where the player explores."""
+        self.board_shape = board_shape
+        self.neighbors = neighbor_table(board_shape)
+        self.num_mines = num_mines
+        self.seed = seed
+        self.chunk_grid = (-(-board_shape[0] // CHUNK_SIZE), -(-board_shape[1] // CHUNK_SIZE))
+        
+        self.chunk_mines = None
+        self.mine_layouts = {}
+        self.chunks = {}
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.revision = 0
+        self.game_over = False
+        self.game_won = False
+        self.game_started = False
+        self.start_time = None
+        self.final_time = 0
+        
+        self.board = ChunkedLayer(self, "board")
+        self.user_board = ChunkedLayer(self, "user")
+        self.flag_board = ChunkedLayer(self, "flags")
+        
+        self.generate_board()
+    
+    def generate_board(self):
+        """Start a new game by splitting the mines between chunks; layouts are drawn lazily per chunk."""
+        if self.seed is None:
+            self.seed = np.random.SeedSequence().entropy
+        rng = np.random.default_rng(self.seed)
+        
+        rows, cols = self.board_shape
+        heights = np.minimum(CHUNK_SIZE, rows - np.arange(self.chunk_grid[0]) * CHUNK_SIZE)
+        widths = np.minimum(CHUNK_SIZE, cols - np.arange(self.chunk_grid[1]) * CHUNK_SIZE)
+        sizes = np.outer(heights, widths)
+        self.chunk_mines = split_mines(rng, sizes.ravel(), self.num_mines).reshape(sizes.shape)
+        
+        self.mine_layouts = {}
+        self.chunks = {}
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.game_over = False
+        self.game_won = False
+        self.game_started = False
+        self.start_time = None
+        self.final_time = 0
+        self.revision += 1
+    
+    def chunk_bounds(self, chunk_row, chunk_col):
+        """Return the (row, col) origin and (height, width) of a chunk."""
+        row0 = chunk_row * CHUNK_SIZE
+        col0 = chunk_col * CHUNK_SIZE
+        return (row0, col0), (min(CHUNK_SIZE, self.board_shape[0] - row0), min(CHUNK_SIZE, self.board_shape[1] - col0))
+    
+    def chunk_layout(self, chunk_row, chunk_col):
+        """Return the mine mask of a chunk, drawing it from the chunk's own seed on first use."""
+        key = (chunk_row, chunk_col)
+        layout = self.mine_layouts.get(key)
+        if layout is None:
+            _, shape = self.chunk_bounds(chunk_row, chunk_col)
+            rng = np.random.default_rng([self.seed, chunk_row, chunk_col])
+            layout = np.zeros(shape[0] * shape[1], dtype=bool)
+            layout[rng.choice(layout.size, self.chunk_mines[key], replace=False)] = True
+            layout = layout.reshape(shape)
+            self.mine_layouts[key] = layout
+        return layout
+    
+    def chunk_values(self, chunk_row, chunk_col):
+        """Compute the board values (-1 for mines, else neighbor counts) of a chunk."""
+        _, (height, width) = self.chunk_bounds(chunk_row, chunk_col)
+        padded = np.zeros((height + 2, width + 2), dtype=np.int8)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = chunk_row + dr, chunk_col + dc
+                if not (0 <= nr < self.chunk_grid[0] and 0 <= nc < self.chunk_grid[1]):
+                    continue
+                layout = self.chunk_layout(nr, nc)
+                # Copy the part of the neighbor that falls inside this chunk's one-cell margin
+                rows = slice(1, height + 1) if dr == 0 else (slice(0, 1) if dr < 0 else slice(height + 1, height + 2))
+                cols = slice(1, width + 1) if dc == 0 else (slice(0, 1) if dc < 0 else slice(width + 1, width + 2))
+                src_rows = slice(None) if dr == 0 else (slice(-1, None) if dr < 0 else slice(0, 1))
+                src_cols = slice(None) if dc == 0 else (slice(-1, None) if dc < 0 else slice(0, 1))
+                padded[rows, cols] = layout[src_rows, src_cols]
+        
+        mines = padded[1:-1, 1:-1].astype(bool)
+        sums = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        counts = sums[:-2] + sums[1:-1] + sums[2:] - padded[1:-1, 1:-1]
+        return np.where(mines, np.int8(-1), counts)
+    
+    def chunk(self, chunk_row, chunk_col):
+        """Return the materialized state of a chunk, creating it on first touch."""
+        key = (chunk_row, chunk_col)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = Chunk(self.chunk_values(chunk_row, chunk_col))
+            self.chunks[key] = chunk
+        return chunk
+    
+    def cell(self, layer, row, col):
+        """Return one cell of a layer without materializing untouched chunks."""
+        chunk = self.chunks.get((row // CHUNK_SIZE, col // CHUNK_SIZE))
+        lr, lc = row % CHUNK_SIZE, col % CHUNK_SIZE
+        if layer == "board":
+            if chunk is None:
+                return self.chunk_values(row // CHUNK_SIZE, col // CHUNK_SIZE)[lr, lc]
+            return chunk.board[lr, lc]
+        if chunk is None:
+            return -2 if layer == "user" else False
+        return chunk.user[lr, lc] if layer == "user" else chunk.flags[lr, lc]
+    
+    def window(self, layer, rows, cols):
+        """Return a dense copy of a rectangular part of a layer."""
+        r0, r1, _ = rows.indices(self.board_shape[0])
+        c0, c1, _ = cols.indices(self.board_shape[1])
+        if layer == "flags":
+            out = np.zeros((max(0, r1 - r0), max(0, c1 - c0)), dtype=bool)
+        else:
+            out = np.full((max(0, r1 - r0), max(0, c1 - c0)), -2, dtype=np.int8)
+        
+        for chunk_row in range(r0 // CHUNK_SIZE, (r1 - 1) // CHUNK_SIZE + 1 if r1 > r0 else 0):
+            for chunk_col in range(c0 // CHUNK_SIZE, (c1 - 1) // CHUNK_SIZE + 1 if c1 > c0 else 0):
+                (row0, col0), (height, width) = self.chunk_bounds(chunk_row, chunk_col)
+                top, bottom = max(r0, row0), min(r1, row0 + height)
+                left, right = max(c0, col0), min(c1, col0 + width)
+                chunk = self.chunks.get((chunk_row, chunk_col))
+                if layer == "board":
+                    source = chunk.board if chunk is not None else self.chunk_values(chunk_row, chunk_col)
+                elif chunk is None:
+                    continue
+                else:
+                    source = chunk.user if layer == "user" else chunk.flags
+                out[top - r0:bottom - r0, left - c0:right - c0] = source[top - row0:bottom - row0, left - col0:right - col0]
+        return out
+    
+    def reveal_cell(self, row, col):
+        """Reveal a cell at the given position."""
+        if 0 <= row < self.board_shape[0] and 0 <= col < self.board_shape[1]:
+            chunk_row, chunk_col = row // CHUNK_SIZE, col // CHUNK_SIZE
+            chunk = self.chunk(chunk_row, chunk_col)
+            lr, lc = row % CHUNK_SIZE, col % CHUNK_SIZE
+            if chunk.user[lr, lc] == -2 and not chunk.flags[lr, lc]:
+                if not self.game_started:
+                    self.game_started = True
+                    self.start_time = time.time()
+                
+                self.revision += 1
+                if chunk.board[lr, lc] == -1:
+                    chunk.user[lr, lc] = -1
+                    self.revealed_count += 1
+                    self.game_over = True
+                    if self.start_time is not None:
+                        self.final_time = time.time() - self.start_time
+                else:
+                    candidates = np.zeros(chunk.board.shape, dtype=bool)
+                    candidates[lr, lc] = True
+                    self.flood_fill(chunk_row, chunk_col, candidates)
+                
+                self.check_win()
+                return True
+        return False
+    
+    def flood_fill(self, chunk_row, chunk_col, candidates):
+        """Reveal candidate cells of a chunk and flood every empty region they open, across chunk borders."""
+        from scipy.ndimage import binary_propagation
+        pending = {(chunk_row, chunk_col): candidates}
+        while pending:
+            (chunk_row, chunk_col), candidates = pending.popitem()
+            chunk = self.chunk(chunk_row, chunk_col)
+            hidden = (chunk.user == -2) & ~chunk.flags
+            opened = candidates & hidden
+            if not opened.any():
+                continue
+            
+            zeros = chunk.board == 0
+            seeds = opened & zeros
+            if seeds.any():
+                region = binary_propagation(seeds, structure=CONNECTIVITY, mask=zeros & hidden)
+                opened |= dilate(region) & hidden
+            else:
+                region = seeds
+            chunk.user[opened] = chunk.board[opened]
+            self.revealed_count += int(opened.sum())
+            
+            # Cells just outside the chunk that touch the region spill into the neighboring chunks
+            height, width = region.shape
+            padded = np.zeros((height + 2, width + 2), dtype=bool)
+            padded[1:-1, 1:-1] = region
+            spill = dilate(padded)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if dr == 0 and dc == 0:
+                        continue
+                    nr, nc = chunk_row + dr, chunk_col + dc
+                    if not (0 <= nr < self.chunk_grid[0] and 0 <= nc < self.chunk_grid[1]):
+                        continue
+                    rows = slice(1, height + 1) if dr == 0 else (slice(0, 1) if dr < 0 else slice(height + 1, height + 2))
+                    cols = slice(1, width + 1) if dc == 0 else (slice(0, 1) if dc < 0 else slice(width + 1, width + 2))
+                    edge = spill[rows, cols]
+                    if not edge.any():
+                        continue
+                    
+                    _, shape = self.chunk_bounds(nr, nc)
+                    target = pending.get((nr, nc))
+                    if target is None:
+                        target = np.zeros(shape, dtype=bool)
+                        pending[(nr, nc)] = target
+                    dest_rows = slice(None) if dr == 0 else (slice(-1, None) if dr < 0 else slice(0, 1))
+                    dest_cols = slice(None) if dc == 0 else (slice(-1, None) if dc < 0 else slice(0, 1))
+                    target[dest_rows, dest_cols] |= edge
+    
+    def toggle_flag(self, row, col):
+        """Toggle flag on a cell at the given position."""
+        if 0 <= row < self.board_shape[0] and 0 <= col < self.board_shape[1]:
+            chunk = self.chunk(row // CHUNK_SIZE, col // CHUNK_SIZE)
+            lr, lc = row % CHUNK_SIZE, col % CHUNK_SIZE
+            if chunk.user[lr, lc] == -2:
+                chunk.flags[lr, lc] = not chunk.flags[lr, lc]
+                self.flag_count += 1 if chunk.flags[lr, lc] else -1
+                self.revision += 1
+                return True
+        return False
+    
+    def get_neighbors(self, row, col):
+        """Get the 8 neighboring cells for a given cell."""
+        return self.neighbors.cells(row, col)
+    
+    def chord_cell(self, row, col):
+        """Reveal all non-flagged neighbors if flag count matches cell value, returning whether any cell was revealed."""
+        revealed = False
+        if 0 <= row < self.board_shape[0] and 0 <= col < self.board_shape[1]:
+            cell_value = self.cell("user", row, col)
+            
+            if cell_value > 0:
+                neighbors = self.get_neighbors(row, col)
+                flag_count = sum(1 for nr, nc in neighbors if self.cell("flags", nr, nc))
+                
+                if flag_count == cell_value:
+                    for nr, nc in neighbors:
+                        if not self.cell("flags", nr, nc):
+                            revealed |= self.reveal_cell(nr, nc)
+        return revealed
+    
+    def check_win(self):
+        """Check if the player has won by revealing all non-mine cells."""
+        if not self.game_over:
+            unrevealed_count = self.board_shape[0] * self.board_shape[1] - self.revealed_count
+            if unrevealed_count == self.num_mines:
+                self.game_won = True
+                self.game_over = True
+                if self.start_time is not None:
+                    self.final_time = time.time() - self.start_time
+    
+    def get_flag_count(self):
+        """Get the number of flags currently placed."""
+        return self.flag_count
+    
+    def get_elapsed_time(self):
+        """Get the elapsed time since the game started."""
+        if not self.game_started or self.start_time is None:
+            return 0
+        if self.game_over:
+            return self.final_time
+        return time.time() - self.start_time
+    
+    def snapshot(self):
+        """Return a copy of the mutable game state that restore() can reinstate on the same board."""
+        chunks = {key: (chunk.user.copy(), chunk.flags.copy()) for key, chunk in self.chunks.items()}
+        return (chunks, self.revealed_count, self.flag_count, self.game_over, self.game_won, self.game_started, self.final_time)
+    
+    def restore(self, state):
+        """Reinstate a state captured by snapshot()."""
+        chunks, self.revealed_count, self.flag_count, self.game_over, self.game_won, self.game_started, self.final_time = state
+        self.chunks = {}
+        for (chunk_row, chunk_col), (user, flags) in chunks.items():
+            chunk = self.chunk(chunk_row, chunk_col)
+            np.copyto(chunk.user, user)
+            np.copyto(chunk.flags, flags)
+        self.revision += 1
+    
+    def memory_report(self):
+        """Report the bytes held by materialized chunks and cached mine layouts."""
+        chunk_bytes = sum(chunk.board.nbytes + chunk.user.nbytes + chunk.flags.nbytes for chunk in self.chunks.values())
+        layout_bytes = sum(layout.nbytes for layout in self.mine_layouts.values())
+        explored = sum(chunk.board.size for chunk in self.chunks.values())
+        total = chunk_bytes + layout_bytes + self.chunk_mines.nbytes
+        return {
+            "cells": self.board_shape[0] * self.board_shape[1],
+            "explored_cells": explored,
+            "arrays": {"chunks": chunk_bytes, "mine_layouts": layout_bytes, "chunk_mines": int(self.chunk_mines.nbytes)},
+            "total_bytes": total,
+            "bytes_per_cell": total / (self.board_shape[0] * self.board_shape[1]),
+            "bytes_per_explored_cell": total / explored if explored else 0.0,
+        }
+    
+    def restart(self):
+        """Restart the game with a fresh seed."""
+        self.seed = None
+        self.generate_board()
@@ -1,17 +1,39 @@
 import pygame as g
 from view import PADDING, SIDEBAR_WIDTH
+from replay import REVEAL, FLAG, CHORD
 
 PEEK_THRESHOLD_MS = 200
+SCROLL_STEP = 3
 
 class GameController:
-    def __init__(self, model, view):
-        """Initialize the game controller."""
+    def __init__(self, model, view, recorder=None, pool=None, history=None):
+        """Initialize the game controller, optionally recording every game, keeping a GameHistory and taking no-guess boards from a BoardPool."""
         self.model = model
         self.view = view
+        self.recorder = recorder
+        self.pool = pool
+        self.history = history
         self.running = True
         self.peeking = False
         self.peek_cell = None
         self.mouse_down_time = 0
+        self.pan_anchor = None
+        
+        if self.recorder:
+            self.recorder.begin(self.model)
+        if self.history:
+            self.history.begin(self.model)
+    
+    def record(self, kind, row, col):
+        """Log an action with the recorder and history, and save the game once it is over."""
+        if self.recorder:
+            self.recorder.log(kind, row, col)
+            if self.model.game_over:
+                self.recorder.finish()
+        if self.history:
+            self.history.log()
+            if self.model.game_over:
+                self.history.finish(self.model)
     
     def is_peek_active(self):
         """Check if peek highlighting should be active based on elapsed time."""
@@ -20,71 +42,143 @@ class GameController:
         elapsed = g.time.get_ticks() - self.mouse_down_time
         return elapsed >= PEEK_THRESHOLD_MS
     
+    def peek_timeout(self):
+        """Return the milliseconds until a held click turns into a peek, or None if none is pending."""
+        if not self.peeking or self.mouse_down_time == 0:
+            return None
+        remaining = self.mouse_down_time + PEEK_THRESHOLD_MS - g.time.get_ticks()
+        return remaining if remaining > 0 else None
+    
+    def new_game(self, timeout=0):
+        """Start the next game on a no-guess board if one is ready within timeout seconds, else on a fresh random board."""
+        board = None
+        if self.pool:
+            board = self.pool.take(self.model.board_shape, self.model.num_mines, timeout)
+        if board is None:
+            self.model.restart()
+        else:
+            self.model.load_board(board.mine_positions)
+        if self.recorder:
+            self.recorder.begin(self.model)
+        if self.history:
+            self.history.begin(self.model)
+        
+        if board is not None:
+            # No-guess boards are only solvable from their start cell, so open it for the player
+            self.model.reveal_cell(*board.start)
+            self.record(REVEAL, *board.start)
+    
     def handle_cell_click(self, mouse_x, mouse_y):
         """Handle left click on a cell to reveal it or chord."""
-        cs = self.view.cell_size
-        col = (mouse_x - self.view.offset_x) // cs
-        row = (mouse_y - self.view.offset_y) // cs
+        cell = self.view.cell_at(mouse_x, mouse_y)
         
-        if 0 <= row < self.model.board_shape[0] and 0 <= col < self.model.board_shape[1]:
+        if cell is not None:
+            row, col = cell
             if self.model.user_board[row, col] > 0:
-                self.model.chord_cell(row, col)
-            else:
-                self.model.reveal_cell(row, col)
+                if self.model.chord_cell(row, col):
+                    self.record(CHORD, row, col)
+            elif self.model.reveal_cell(row, col):
+                self.record(REVEAL, row, col)
     
     def handle_cell_right_click(self, mouse_x, mouse_y):
         """Handle right click on a cell to toggle flag."""
+        cell = self.view.cell_at(mouse_x, mouse_y)
+        if cell is not None and self.model.toggle_flag(*cell):
+            self.record(FLAG, *cell)
+    
+    def handle_key(self, event):
+        """Scroll the viewport with the arrow keys, a page at a time with shift or page up/down; F3 toggles the overlay, H the heatmap."""
+        page_rows = max(1, self.view.visible_rows - 1)
+        page_cols = max(1, self.view.visible_cols - 1)
+        step_rows, step_cols = (page_rows, page_cols) if event.mod & g.KMOD_SHIFT else (1, 1)
+        
+        if event.key == g.K_UP:
+            self.view.scroll_by(-step_rows, 0)
+        elif event.key == g.K_DOWN:
+            self.view.scroll_by(step_rows, 0)
+        elif event.key == g.K_LEFT:
+            self.view.scroll_by(0, -step_cols)
+        elif event.key == g.K_RIGHT:
+            self.view.scroll_by(0, step_cols)
+        elif event.key == g.K_PAGEUP:
+            self.view.scroll_by(-page_rows, 0)
+        elif event.key == g.K_PAGEDOWN:
+            self.view.scroll_by(page_rows, 0)
+        elif event.key == g.K_F3:
+            self.view.toggle_overlay()
+        elif event.key == g.K_h:
+            self.view.toggle_heatmap()
+    
+    def handle_pan(self, mouse_x, mouse_y):
+        """Drag the viewport while the middle mouse button is held."""
+        x, y, row, col = self.pan_anchor
         cs = self.view.cell_size
-        col = (mouse_x - self.view.offset_x) // cs
-        row = (mouse_y - self.view.offset_y) // cs
-        self.model.toggle_flag(row, col)
+        self.view.scroll_to(row - (mouse_y - y) // cs, col - (mouse_x - x) // cs)
     
     def handle_button_click(self, mouse_x, mouse_y, restart_rect, exit_rect):
         """Handle clicks on restart and exit buttons."""
         if restart_rect[0] <= mouse_x <= restart_rect[0] + restart_rect[2] and restart_rect[1] <= mouse_y <= restart_rect[1] + restart_rect[3]:
-            self.model.restart()
+            self.new_game()
         elif exit_rect[0] <= mouse_x <= exit_rect[0] + exit_rect[2] and exit_rect[1] <= mouse_y <= exit_rect[1] + exit_rect[3]:
             self.running = False
     
     def process_events(self):
-        """Process pygame events including mouse clicks and window events."""
+        """Process all pending pygame events."""
         for event in g.event.get():
-            if event.type == g.QUIT:
-                self.running = False
-            elif event.type == g.VIDEORESIZE:
-                # pygame 1 fallback: only needed if not on SDL2
-                w, h = event.w, event.h
-                self.view.update_dimensions(w, h)
-            elif event.type == g.WINDOWRESIZED:
-                # pygame 2 / SDL2: surface already resized, just update layout
-                w, h = self.view.screen.get_size()
-                self.view.update_dimensions(w, h)
-            elif event.type == g.MOUSEBUTTONDOWN:
-                if self.model.game_over:
-                    if event.button == 1 and self.view.restart_rect and self.view.exit_rect:
-                        mouse_x, mouse_y = event.pos
-                        self.handle_button_click(mouse_x, mouse_y, self.view.restart_rect, self.view.exit_rect)
-                else:
-                    if event.button == 1:
-                        mouse_x, mouse_y = event.pos
-                        col = (mouse_x - self.view.offset_x) // self.view.cell_size
-                        row = (mouse_y - self.view.offset_y) // self.view.cell_size
-                        if 0 <= row < self.model.board_shape[0] and 0 <= col < self.model.board_shape[1]:
-                            self.peeking = True
-                            self.peek_cell = (row, col)
-                            self.mouse_down_time = g.time.get_ticks()
-                    elif event.button == 3:
-                        mouse_x, mouse_y = event.pos
-                        self.handle_cell_right_click(mouse_x, mouse_y)
-            elif event.type == g.MOUSEBUTTONUP:
-                if event.button == 1 and not self.model.game_over:
-                    mouse_up_time = g.time.get_ticks()
-                    click_duration = mouse_up_time - self.mouse_down_time
-                    
-                    if click_duration < PEEK_THRESHOLD_MS and self.peek_cell:
-                        mouse_x, mouse_y = event.pos
-                        self.handle_cell_click(mouse_x, mouse_y)
-                    
-                    self.peeking = False
-                    self.peek_cell = None
-                    self.mouse_down_time = 0
+            self.handle_event(event)
+    
+    def handle_event(self, event):
+        """Handle one pygame event including mouse clicks and window events."""
+        if event.type == g.QUIT:
+            self.running = False
+        elif event.type == g.VIDEORESIZE:
+            # pygame 1 fallback: only needed if not on SDL2
+            w, h = event.w, event.h
+            self.view.update_dimensions(w, h)
+        elif event.type == g.WINDOWRESIZED:
+            # pygame 2 / SDL2: surface already resized, just update layout
+            w, h = self.view.screen.get_size()
+            self.view.update_dimensions(w, h)
+        elif event.type == g.WINDOWEXPOSED:
+            # Only dirty rects are pushed to the display, so repaint everything after an expose
+            self.view.full_redraw = True
+        elif event.type == g.KEYDOWN:
+            self.handle_key(event)
+        elif event.type == g.MOUSEWHEEL:
+            self.view.scroll_by(-event.y * SCROLL_STEP, event.x * SCROLL_STEP)
+        elif event.type == g.MOUSEMOTION:
+            if self.pan_anchor:
+                self.handle_pan(*event.pos)
+        elif event.type == g.MOUSEBUTTONDOWN and event.button == 2:
+            mouse_x, mouse_y = event.pos
+            self.pan_anchor = (mouse_x, mouse_y, self.view.view_row, self.view.view_col)
+        elif event.type == g.MOUSEBUTTONUP and event.button == 2:
+            self.pan_anchor = None
+        elif event.type == g.MOUSEBUTTONDOWN:
+            if self.model.game_over:
+                if event.button == 1 and self.view.restart_rect and self.view.exit_rect:
+                    mouse_x, mouse_y = event.pos
+                    self.handle_button_click(mouse_x, mouse_y, self.view.restart_rect, self.view.exit_rect)
+            else:
+                if event.button == 1:
+                    mouse_x, mouse_y = event.pos
+                    cell = self.view.cell_at(mouse_x, mouse_y)
+                    if cell is not None:
+                        self.peeking = True
+                        self.peek_cell = cell
+                        self.mouse_down_time = g.time.get_ticks()
+                elif event.button == 3:
+                    mouse_x, mouse_y = event.pos
+                    self.handle_cell_right_click(mouse_x, mouse_y)
+        elif event.type == g.MOUSEBUTTONUP:
+            if event.button == 1 and not self.model.game_over:
+                mouse_up_time = g.time.get_ticks()
+                click_duration = mouse_up_time - self.mouse_down_time
+                
+                if click_duration < PEEK_THRESHOLD_MS and self.peek_cell:
+                    mouse_x, mouse_y = event.pos
+                    self.handle_cell_click(mouse_x, mouse_y)
+                
+                self.peeking = False
+                self.peek_cell = None
+                self.mouse_down_time = 0
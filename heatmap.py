@@ -0,0 +1,87 @@
+import numpy as np
+from solver import Solver, frontier_components, enumerate_component, combine_components
+
+# Above this many cells the per-cell constraint bookkeeping costs more than a hint is worth
+HEATMAP_MAX_CELLS = 40_000
+# Backtracking steps per component, a few milliseconds; larger components are estimated like the interior
+HEATMAP_BUDGET = 4_000
+
+class Heatmap:
+    def __init__(self, board_shape, num_mines):
+        """Track the mine probability of every hidden cell of a board, re-enumerating only the components that changed."""
+        self.board_shape = board_shape
+        self.num_mines = num_mines
+        # The solver is only used for its constraint bookkeeping, which already updates incrementally
+        self.solver = Solver(board_shape, num_mines)
+        self.memo = {}
+        self.probabilities = np.full(board_shape, np.nan, dtype=np.float32)
+        self.revision = None
+        self.enumerated = 0
+    
+    def update(self, model):
+        """Bring the probabilities up to date with the model, returning a board of them with NaN on known cells."""
+        if model.revision == self.revision:
+            return self.probabilities
+        self.revision = model.revision
+        # Revealed cells only turn hidden again on a new board, where the last game's deductions no longer hold
+        if np.any((self.solver.user != -2) & (model.user_board.ravel() == -2)):
+            self.solver = Solver(self.board_shape, self.num_mines)
+            self.memo = {}
+        solver = self.solver
+        solver.update(model.user_board, model.flag_board)
+        solver.propagate()
+        # Cells the rules already settle are fixed at 0 or 1 and taken out of the constraints, which splits
+        # and shrinks the components left to enumerate
+        safe = {cell for cell in solver.safe if solver.is_unknown(cell)}
+        mines = {cell for cell in solver.mines if solver.is_unknown(cell)}
+        # A constraint the pinned cells leave unmet, or a component with no valid layout at all as opposed to one
+        # too large to enumerate, means a wrong flag
+        impossible = False
+        constraints = []
+        for unknown, remaining in solver.constraints.values():
+            left = unknown - safe - mines
+            if left:
+                constraints.append((left, remaining - len(unknown & mines)))
+            elif remaining != len(unknown & mines):
+                impossible = True
+        
+        # A component's layouts depend only on its constraints, so any component a move did not touch is a memo hit
+        memo = {}
+        solved = []
+        self.enumerated = 0
+        for cells, group in frontier_components(constraints):
+            key = frozenset(group)
+            if key in self.memo:
+                result = self.memo[key]
+            else:
+                result = enumerate_component(cells, group, HEATMAP_BUDGET)
+                self.enumerated += 1
+            memo[key] = result
+            if result:
+                solved.append(result)
+            elif result is not None:
+                impossible = True
+        self.memo = memo
+        
+        unknown = (model.user_board == -2) & ~model.flag_board
+        interior = (int(np.count_nonzero(unknown)) - len(safe) - len(mines)
+                    - sum(len(next(iter(result.values()))[1]) for result in solved))
+        mines_left = self.num_mines - solver.flag_count - len(mines)
+        component_probabilities, interior_probability = combine_components(solved, interior, mines_left)
+        
+        probabilities = np.full(unknown.size, np.nan, dtype=np.float32)
+        # Flags that no layout can satisfy leave nothing meaningful to show
+        if impossible:
+            consistent = False
+        elif solved:
+            consistent = any(component_probabilities)
+        else:
+            consistent = 0 <= mines_left <= interior
+        if consistent:
+            probabilities[unknown.ravel()] = interior_probability
+            for result in component_probabilities:
+                probabilities[list(result)] = list(result.values())
+            probabilities[list(safe)] = 0
+            probabilities[list(mines)] = 1
+        self.probabilities = probabilities.reshape(self.board_shape)
+        return self.probabilities
@@ -0,0 +1,157 @@
+import queue
+import sqlite3
+import threading
+import time
+import numpy as np
+from model import GameModel
+
+# Finished games are committed together once this many are queued or the oldest has waited FLUSH_INTERVAL seconds
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 1.0
+# Boards larger than this are not kept in memory whole, so their 3BV is left empty
+BBBV_MAX_CELLS = 4_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    seed TEXT,
+    won INTEGER NOT NULL,
+    time REAL NOT NULL,
+    clicks INTEGER NOT NULL,
+    bbbv INTEGER
+);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (rows, cols, mines, won, time);
+CREATE TABLE IF NOT EXISTS stats (
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    best_time REAL,
+    PRIMARY KEY (rows, cols, mines)
+);
+"""
+
+INSERT_GAME = "INSERT INTO games (finished, rows, cols, mines, seed, won, time, clicks, bbbv) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+# Per-configuration totals are kept up to date with every batch, so win rates never scan the games table
+UPSERT_STATS = """
+INSERT INTO stats (rows, cols, mines, games, wins, best_time) VALUES (?, ?, ?, 1, ?, ?)
+ON CONFLICT (rows, cols, mines) DO UPDATE SET
+    games = games + 1,
+    wins = wins + excluded.wins,
+    best_time = CASE WHEN best_time IS NULL OR excluded.best_time < best_time THEN excluded.best_time ELSE best_time END
+"""
+
+def connect(path):
+    """Open the history database, creating its tables and indexes if needed."""
+    connection = sqlite3.connect(path)
+    # WAL lets the UI thread read while the writer thread commits
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+def count_bbbv(board):
+    """Return the 3BV of a board of values, the fewest clicks that clear it."""
+    from analytics import board_metrics
+    return int(board_metrics(board[None])[0][0])
+
+class GameHistory:
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        """Store finished games in SQLite through a writer thread, keeping per-configuration stats cached in memory."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.connection = connect(path)
+        # Read once here and then updated as games finish, so the sidebar never waits on the database
+        self.stats = {(rows, cols, mines): [games, wins, best_time] for rows, cols, mines, games, wins, best_time
+                      in self.connection.execute("SELECT rows, cols, mines, games, wins, best_time FROM stats")}
+        self.seed = None
+        self.clicks = 0
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.write_games, daemon=True)
+        self.writer.start()
+    
+    def begin(self, model):
+        """Start tracking a new game on the model's current board."""
+        # Only boards whose mines are yet to be placed from the seed can be dealt again from it
+        self.seed = None if isinstance(model, GameModel) and model.board is not None else model.seed
+        self.clicks = 0
+    
+    def log(self):
+        """Count one player action of the current game."""
+        self.clicks += 1
+    
+    def finish(self, model):
+        """Queue the finished game for writing and fold it into the cached stats."""
+        rows, cols = model.board_shape
+        won = bool(model.game_won)
+        elapsed = float(model.final_time)
+        board = np.array(model.board) if isinstance(model, GameModel) and rows * cols <= BBBV_MAX_CELLS else None
+        seed = str(self.seed) if self.seed is not None else None
+        self.queue.put((time.time(), rows, cols, model.num_mines, seed, won, elapsed, self.clicks, board))
+        
+        stats = self.stats.setdefault((rows, cols, model.num_mines), [0, 0, None])
+        stats[0] += 1
+        if won:
+            stats[1] += 1
+            if stats[2] is None or elapsed < stats[2]:
+                stats[2] = elapsed
+    
+    def write_games(self):
+        """Commit queued games in batches until close() sends the stop marker."""
+        connection = connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                stopping = True
+            
+            games = []
+            for finished, rows, cols, mines, seed, won, elapsed, clicks, board in batch:
+                bbbv = count_bbbv(board) if board is not None else None
+                games.append((finished, rows, cols, mines, seed, won, elapsed, clicks, bbbv))
+            with connection:
+                connection.executemany(INSERT_GAME, games)
+                connection.executemany(UPSERT_STATS, [(rows, cols, mines, won, elapsed if won else None)
+                                                      for _, rows, cols, mines, _, won, elapsed, _, _ in games])
+        connection.close()
+    
+    def close(self):
+        """Write every queued game and stop the writer thread."""
+        self.queue.put(None)
+        self.writer.join()
+        self.connection.close()
+    
+    def best_time(self, board_shape, num_mines):
+        """Return the cached best winning time for a board configuration, or None before its first win."""
+        stats = self.stats.get((*board_shape, num_mines))
+        return stats[2] if stats else None
+    
+    def best_times(self, board_shape, num_mines, limit=10):
+        """Return the fastest wins of a configuration as (time, clicks, 3BV, finished) rows."""
+        return self.connection.execute(
+            "SELECT time, clicks, bbbv, finished FROM games WHERE rows = ? AND cols = ? AND mines = ? AND won = 1 "
+            "ORDER BY time LIMIT ?", (*board_shape, num_mines, limit)).fetchall()
+    
+    def win_rates(self):
+        """Return (rows, cols, mines, games, wins, win rate, best time) for every configuration played."""
+        return [(rows, cols, mines, games, wins, wins / games, best_time) for rows, cols, mines, games, wins, best_time
+                in self.connection.execute("SELECT rows, cols, mines, games, wins, best_time FROM stats ORDER BY games DESC")]
+    
+    def recent(self, limit=20):
+        """Return the latest games as (finished, rows, cols, mines, seed, won, time, clicks, 3BV) rows, newest first."""
+        return self.connection.execute(
+            "SELECT finished, rows, cols, mines, seed, won, time, clicks, bbbv FROM games ORDER BY id DESC LIMIT ?",
+            (limit,)).fetchall()
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from server import GameServer, DEFAULT_HOST
+
+DEFAULT_CLIENTS = 100
+DEFAULT_DURATION = 10.0
+BOARD = (16, 16, 40)
+
+async def play_client(host, port, deadline, latencies, rng):
+    """Play games over one connection until the deadline, revealing random hidden cells and timing each reply."""
+    reader, writer = await asyncio.open_connection(host, port)
+    rows, cols, mines = BOARD
+    games = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(f"NEW {rows} {cols} {mines}\n".encode())
+            session = (await reader.readline()).split()[1].decode()
+            hidden = set(range(rows * cols))
+            status = b"playing"
+            while status == b"playing" and hidden and time.perf_counter() < deadline:
+                # Only the server's deltas tell the client which cells are still hidden
+                cell = rng.choice(tuple(hidden))
+                start = time.perf_counter()
+                writer.write(f"ACT {session} r{cell // cols},{cell % cols}\n".encode())
+                reply = (await reader.readline()).split()
+                latencies.append(time.perf_counter() - start)
+                status = reply[1]
+                for change in reply[2:]:
+                    index, code = change.split(b"=")
+                    if code not in (b"h", b"f"):
+                        hidden.discard(int(index))
+            writer.write(f"END {session}\n".encode())
+            await reader.readline()
+            games += 1
+    finally:
+        writer.close()
+    return games
+
+async def run_load(clients, duration, host=None, port=0, seed=0):
+    """Run clients against a server, starting one in-process when host is None, and return the measurements."""
+    server = None
+    if host is None:
+        server = await GameServer().start(DEFAULT_HOST, port)
+        host, port = server.sockets[0].getsockname()[:2]
+    
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + duration
+    games = await asyncio.gather(*(play_client(host, port, deadline, latencies, random.Random(seed + i))
+                                   for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "clients": clients,
+        "games": sum(games),
+        "actions": len(latencies),
+        "actions_per_second": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latency_ms, 50)) if len(latencies) else 0.0,
+        "p99_ms": float(np.percentile(latency_ms, 99)) if len(latencies) else 0.0,
+    }
+
+def main():
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description="Simulate many clients against the Minesweeper server over loopback.")
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to run")
+    parser.add_argument("--host", help="server to test (default: start one in this process)")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the clients' moves")
+    args = parser.parse_args()
+    if args.host and not args.port:
+        parser.error("--port is required with --host")
+    
+    result = asyncio.run(run_load(args.clients, args.duration, args.host, args.port, args.seed))
+    print(f"{result['clients']} clients, {result['games']} games, {result['actions']} actions")
+    print(f"{result['actions_per_second']:.0f} actions/s, p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
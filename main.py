@@ -1,32 +1,93 @@
+import time
+# Taken before the other imports so --startup-profile can report what loading them cost
+IMPORT_START = time.perf_counter()
+import argparse
+import threading
 import pygame as g
-from model import GameModel
+from model import GameModel, preload
+from chunked import ChunkedGameModel
 from view import GameView, CELL_SIZE, PADDING, SIDEBAR_WIDTH
 from controller import GameController
+from replay import GameRecorder
+from scheduler import FrameScheduler
+from profiler import FrameProfiler
+from history import GameHistory
+IMPORTS_DONE = time.perf_counter()
+
+# Boards with at least this many cells use chunked, lazily materialized storage
+LARGE_BOARD_CELLS = 4_000_000
+MAX_WINDOW_WIDTH = 1920
+MAX_WINDOW_HEIGHT = 1080
+
+def parse_args():
+    """Parse the board configuration from the command line."""
+    parser = argparse.ArgumentParser(description="Play Minesweeper.")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--large", action="store_true", help="use chunked storage regardless of board size")
+    parser.add_argument("--record", metavar="PATH", help="append every finished game to this replay file")
+    parser.add_argument("--history", metavar="PATH", help="keep every finished game in this SQLite database")
+    parser.add_argument("--no-guess", action="store_true", help="only deal boards the solver can finish without guessing")
+    parser.add_argument("--seed", type=int, help="seed of the first game's mine layout")
+    parser.add_argument("--low-power", action="store_true", help="update the timer once a second instead of every frame")
+    parser.add_argument("--profile", action="store_true", help="time each frame phase; F3 shows the overlay")
+    parser.add_argument("--startup-profile", action="store_true", help="print import, setup and first-frame timings")
+    parser.add_argument("--profile-out", metavar="PATH", help="profile and write per-frame timings to PATH (.json or .csv) on exit")
+    return parser.parse_args()
 
 def main():
     """Initialize and run the Minesweeper game."""
+    args = parse_args()
     g.init()
     
-    model = GameModel(board_shape=(16, 16), num_mines=40)
+    board_shape = (args.rows, args.cols)
+    if args.large or args.rows * args.cols >= LARGE_BOARD_CELLS:
+        model = ChunkedGameModel(board_shape=board_shape, num_mines=args.mines, seed=args.seed)
+    else:
+        model = GameModel(board_shape=board_shape, num_mines=args.mines, seed=args.seed)
     
     grid_width = model.board_shape[1] * CELL_SIZE
     grid_height = model.board_shape[0] * CELL_SIZE
-    screen_width = grid_width + SIDEBAR_WIDTH + PADDING * 2
-    screen_height = max(grid_height + PADDING * 2, 500)
+    screen_width = min(grid_width + SIDEBAR_WIDTH + PADDING * 2, MAX_WINDOW_WIDTH)
+    screen_height = min(max(grid_height + PADDING * 2, 500), MAX_WINDOW_HEIGHT)
     
     screen = g.display.set_mode((screen_width, screen_height), g.RESIZABLE)
     g.display.set_caption("Minesweeper")
     
     view = GameView(screen, model)
-    controller = GameController(model, view)
+    view.update_dimensions(screen_width, screen_height)
+    recorder = GameRecorder(args.record) if args.record else None
+    history = GameHistory(args.history) if args.history else None
+    view.history = history
+    pool = None
+    if args.no_guess and isinstance(model, GameModel):
+        # Worker processes are only needed for no-guess games, so their imports stay off the normal startup path
+        from board_pool import BoardPool
+        pool = BoardPool()
+        pool.fill(model.board_shape, model.num_mines)
+    controller = GameController(model, view, recorder, pool, history)
+    if pool:
+        # Wait for the first no-guess board rather than dealing a random one
+        controller.new_game(timeout=None)
     
-    clock = g.time.Clock()
+    profiler = FrameProfiler(keep_log=bool(args.profile_out)) if args.profile or args.profile_out else None
+    ready = time.perf_counter()
     
-    while controller.running:
-        controller.process_events()
-        view.render(controller)
-        g.display.flip()
-        clock.tick(60)
+    def first_frame():
+        """Load what the first reveal needs in the background once the first frame is up, reporting startup if asked."""
+        threading.Thread(target=preload, daemon=True).start()
+        if args.startup_profile:
+            shown = time.perf_counter()
+            print(f"imports {(IMPORTS_DONE - IMPORT_START) * 1000:.1f} ms, setup {(ready - IMPORTS_DONE) * 1000:.1f} ms, "
+                  f"first render {(shown - ready) * 1000:.1f} ms, first frame {(shown - IMPORT_START) * 1000:.1f} ms")
+    FrameScheduler(controller, view, args.low_power, profiler).run(first_frame)
+    if args.profile_out:
+        profiler.export(args.profile_out)
+    if pool:
+        pool.close()
+    if history:
+        history.close()
     
     g.quit()
 
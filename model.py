@@ -1,46 +1,111 @@
 import numpy as np
-from scipy.signal import convolve2d
 import time
+from neighbors import count_neighbors, neighbor_table
+
+CONNECTIVITY = np.ones((3, 3), dtype=bool)
+
+REVEAL = 0
+FLAG = 1
+CHORD = 2
+
+# Status transitions reported in a BoardDelta
+GAME_STARTED = "started"
+GAME_LOST = "lost"
+GAME_WON = "won"
+
+# Per-cell footprint of the original layout: float64 mine_board, int64 board and user_board, bool flag_board
+LEGACY_BYTES_PER_CELL = 8 + 8 + 8 + 1
+
+def preload():
+    """Import the scipy routines deferred until the first reveal, for a background thread to run at startup."""
+    import scipy.ndimage
+
+def seeded_mine_positions(board_shape, num_mines, seed, row, col):
+    """Return the flat mine positions a seed gives, keeping the first revealed cell and its neighbors clear when there is room."""
+    size = board_shape[0] * board_shape[1]
+    cell = row * board_shape[1] + col
+    exclude = np.append(neighbor_table(board_shape).flat(row, col), cell)
+    if size - len(exclude) < num_mines:
+        exclude = exclude[-1:] if size - 1 >= num_mines else exclude[:0]
+    allowed = np.delete(np.arange(size), exclude)
+    rng = np.random.default_rng(seed)
+    return rng.choice(allowed, num_mines, replace=False)
+
+class BoardDelta:
+    def __init__(self, cells, values, flags, events, applied):
+        """Hold what a batch of actions changed: flat cell indices with their new user values and flags."""
+        self.cells = cells
+        self.values = values
+        self.flags = flags
+        self.events = events
+        self.applied = applied
+    
+    def __len__(self):
+        """Return the number of changed cells."""
+        return len(self.cells)
 
 class GameModel:
-    def __init__(self, board_shape=(8, 8), num_mines=10):
-        """Initialize the game model with board dimensions and mine count."""
+    def __init__(self, board_shape=(8, 8), num_mines=10, mine_positions=None, seed=None):
+        """Initialize the game model, with a fixed mine layout or a seed for placing mines on the first reveal."""
         self.board_shape = board_shape
         self.num_mines = num_mines
-        self.kernel = np.array([[1, 1, 1],
-                                [1, 1, 1],
-                                [1, 1, 1]])
+        self.neighbors = neighbor_table(board_shape)
         
-        self.mine_board = None
+        self.seed = None
         self.board = None
         self.user_board = None
         self.flag_board = None
+        self.zero_labels = None
+        self.zero_regions = None
+        self.unrevealed_count = 0
+        self.flag_count = 0
+        self.revision = 0
+        # Flat indices of changed cells, collected only while apply_actions is running
+        self.journal = None
         self.game_over = False
         self.game_won = False
         self.game_started = False
         self.start_time = None
         self.final_time = 0
         
-        self.generate_board()
+        self.generate_board(mine_positions, seed)
     
-    def generate_board(self):
-        """Generate a new game board with randomly placed mines."""
-        self.mine_board = np.zeros(shape=self.board_shape)
-        mine_positions = np.random.choice(self.mine_board.size, self.num_mines, replace=False)
-        self.mine_board.flat[mine_positions] = -1
-        
-        mines_only = (self.mine_board == -1).astype(int)
-        neighbour_count = convolve2d(mines_only, self.kernel, mode='same', boundary='fill')
-        neighbour_count -= mines_only
-        
-        self.board = np.where(self.mine_board == -1, -1, neighbour_count)
-        self.user_board = np.full(self.board_shape, -2, dtype=int)
+    def generate_board(self, mine_positions=None, seed=None):
+        """Start a new game with mines at the given flat positions, or placed from the seed on the first reveal."""
+        # The same seed and first click always give the same board, so the seed alone identifies a game
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.board = None
+        self.zero_labels = None
+        self.zero_regions = None
+        self.user_board = np.full(self.board_shape, -2, dtype=np.int8)
         self.flag_board = np.zeros(self.board_shape, dtype=bool)
+        self.unrevealed_count = self.board_shape[0] * self.board_shape[1]
+        self.flag_count = 0
         self.game_over = False
         self.game_won = False
         self.game_started = False
         self.start_time = None
         self.final_time = 0
+        self.revision += 1
+        if mine_positions is not None:
+            self.lay_mines(mine_positions)
+    
+    def place_mines(self, row, col):
+        """Place the mines from the game's seed, keeping the given cell and its neighbors clear when there is room."""
+        self.lay_mines(seeded_mine_positions(self.board_shape, self.num_mines, self.seed, row, col))
+    
+    def lay_mines(self, mine_positions):
+        """Build the board values and empty regions for mines at the given flat positions."""
+        # scipy is imported on first use rather than with the module; loading it dominated startup
+        from scipy.ndimage import label, find_objects
+        mines = np.zeros(self.board_shape, dtype=bool)
+        mines.flat[mine_positions] = True
+        self.board = np.where(mines, np.int8(-1), count_neighbors(mines))
+        
+        # Label the 8-connected empty regions once so a reveal can open a whole region as a single mask
+        labels, region_count = label(self.board == 0, structure=CONNECTIVITY)
+        self.zero_labels = labels.astype(np.min_scalar_type(region_count), copy=False)
+        self.zero_regions = find_objects(self.zero_labels)
     
     def reveal_cell(self, row, col):
         """Reveal a cell at the given position."""
@@ -49,8 +114,14 @@ class GameModel:
                 if not self.game_started:
                     self.game_started = True
                     self.start_time = time.time()
+                if self.board is None:
+                    self.place_mines(row, col)
                 
                 self.user_board[row, col] = self.board[row, col]
+                self.unrevealed_count -= 1
+                self.revision += 1
+                if self.journal is not None:
+                    self.journal.append(row * self.board_shape[1] + col)
                 if self.board[row, col] == -1:
                     self.game_over = True
                     if self.start_time is not None:
@@ -63,55 +134,94 @@ class GameModel:
         return False
     
     def flood_fill(self, row, col):
-        """Recursively reveal all connected empty cells and their numbered borders."""
-        neighbors = self.get_neighbors(row, col)
+        """Reveal the empty region containing (row, col) together with its numbered border."""
+        from scipy.ndimage import label, binary_dilation
+        region_id = self.zero_labels[row, col]
+        if region_id == 0:
+            return
         
-        for nr, nc in neighbors:
-            if self.user_board[nr, nc] == -2 and not self.flag_board[nr, nc]:
-                self.user_board[nr, nc] = self.board[nr, nc]
-                
-                if self.board[nr, nc] == 0:
-                    self.flood_fill(nr, nc)
+        rows, cols = self.zero_regions[region_id - 1]
+        r0, r1 = max(0, rows.start - 1), min(self.board_shape[0], rows.stop + 1)
+        c0, c1 = max(0, cols.start - 1), min(self.board_shape[1], cols.stop + 1)
+        user = self.user_board[r0:r1, c0:c1]
+        flags = self.flag_board[r0:r1, c0:c1]
+        hidden = (user == -2) & ~flags
+        
+        region = self.zero_labels[r0:r1, c0:c1] == region_id
+        blocked = region & ~hidden
+        blocked[row - r0, col - c0] = False
+        if blocked.any():
+            # Flags or earlier reveals split the region, so only the part reachable from here opens
+            reachable = region & hidden
+            reachable[row - r0, col - c0] = True
+            parts, _ = label(reachable, structure=CONNECTIVITY)
+            region = parts == parts[row - r0, col - c0]
+        
+        reveal = binary_dilation(region, structure=CONNECTIVITY) & hidden
+        user[reveal] = self.board[r0:r1, c0:c1][reveal]
+        self.unrevealed_count -= int(np.count_nonzero(reveal))
+        if self.journal is not None:
+            rows, cols = np.nonzero(reveal)
+            self.journal.append((rows + r0) * self.board_shape[1] + cols + c0)
     
     def toggle_flag(self, row, col):
         """Toggle flag on a cell at the given position."""
         if 0 <= row < self.board_shape[0] and 0 <= col < self.board_shape[1]:
             if self.user_board[row, col] == -2:
                 self.flag_board[row, col] = not self.flag_board[row, col]
+                self.flag_count += 1 if self.flag_board[row, col] else -1
+                self.revision += 1
+                if self.journal is not None:
+                    self.journal.append(row * self.board_shape[1] + col)
                 return True
         return False
     
     def get_neighbors(self, row, col):
         """Get the 8 neighboring cells for a given cell."""
-        neighbors = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < self.board_shape[0] and 0 <= nc < self.board_shape[1]:
-                    neighbors.append((nr, nc))
-        return neighbors
+        return self.neighbors.cells(row, col)
     
     def chord_cell(self, row, col):
-        """Reveal all non-flagged neighbors if flag count matches cell value."""
+        """Reveal all non-flagged neighbors if flag count matches cell value, returning whether any cell was revealed."""
+        revealed = False
         if 0 <= row < self.board_shape[0] and 0 <= col < self.board_shape[1]:
             cell_value = self.user_board[row, col]
             
             if cell_value > 0:
-                neighbors = self.get_neighbors(row, col)
-                flag_count = sum(1 for nr, nc in neighbors if self.flag_board[nr, nc])
+                neighbors = self.neighbors.flat(row, col)
+                flags = self.flag_board.ravel()[neighbors]
                 
-                if flag_count == cell_value:
-                    for nr, nc in neighbors:
-                        if not self.flag_board[nr, nc]:
-                            self.reveal_cell(nr, nc)
+                if np.count_nonzero(flags) == cell_value:
+                    for cell in neighbors[~flags]:
+                        revealed |= self.reveal_cell(*divmod(int(cell), self.board_shape[1]))
+        return revealed
+    
+    def apply_actions(self, actions):
+        """Apply (kind, row, col) actions in order, skipping any after the game ends, and return a BoardDelta."""
+        handlers = {REVEAL: self.reveal_cell, FLAG: self.toggle_flag, CHORD: self.chord_cell}
+        self.journal = []
+        events = []
+        applied = np.zeros(len(actions), dtype=bool)
+        try:
+            for i, (kind, row, col) in enumerate(actions):
+                if self.game_over:
+                    break
+                started = self.game_started
+                applied[i] = bool(handlers[kind](row, col))
+                if self.game_started and not started:
+                    events.append((i, GAME_STARTED))
+                if self.game_over:
+                    events.append((i, GAME_WON if self.game_won else GAME_LOST))
+            
+            journal = [np.atleast_1d(entry) for entry in self.journal]
+            cells = np.unique(np.concatenate(journal)) if journal else np.empty(0, dtype=np.intp)
+        finally:
+            self.journal = None
+        return BoardDelta(cells, self.user_board.ravel()[cells], self.flag_board.ravel()[cells], events, applied)
     
     def check_win(self):
         """Check if the player has won by revealing all non-mine cells."""
         if not self.game_over:
-            unrevealed_count = np.sum(self.user_board == -2)
-            if unrevealed_count == self.num_mines:
+            if self.unrevealed_count == self.num_mines:
                 self.game_won = True
                 self.game_over = True
                 if self.start_time is not None:
@@ -119,7 +229,7 @@ class GameModel:
     
     def get_flag_count(self):
         """Get the number of flags currently placed."""
-        return np.sum(self.flag_board)
+        return self.flag_count
     
     def get_elapsed_time(self):
         """Get the elapsed time since the game started."""
@@ -129,6 +239,44 @@ class GameModel:
             return self.final_time
         return time.time() - self.start_time
     
-    def restart(self):
-        """Restart the game by generating a new board."""
-        self.generate_board()
+    def snapshot(self):
+        """Return a copy of the mutable game state that restore() can reinstate on the same board."""
+        return (self.user_board.copy(), self.flag_board.copy(), self.unrevealed_count, self.flag_count,
+                self.game_over, self.game_won, self.game_started, self.final_time,
+                (self.board, self.zero_labels, self.zero_regions))
+    
+    def restore(self, state):
+        """Reinstate a state captured by snapshot()."""
+        user_board, flag_board, self.unrevealed_count, self.flag_count, self.game_over, self.game_won, self.game_started, self.final_time, layout = state
+        # The layout is never modified once placed, so the snapshot shares it; before the first reveal it is None
+        self.board, self.zero_labels, self.zero_regions = layout
+        np.copyto(self.user_board, user_board)
+        np.copyto(self.flag_board, flag_board)
+        self.revision += 1
+    
+    def memory_report(self):
+        """Report the bytes held per cell by the board arrays, next to the original layout's footprint."""
+        arrays = {
+            "board": self.board,
+            "user_board": self.user_board,
+            "flag_board": self.flag_board,
+            "zero_labels": self.zero_labels,
+        }
+        sizes = {name: int(array.nbytes) for name, array in arrays.items() if array is not None}
+        cells = self.board_shape[0] * self.board_shape[1]
+        total = sum(sizes.values())
+        return {
+            "cells": cells,
+            "arrays": sizes,
+            "total_bytes": total,
+            "bytes_per_cell": total / cells,
+            "legacy_bytes_per_cell": LEGACY_BYTES_PER_CELL,
+        }
+    
+    def restart(self, seed=None):
+        """Restart the game by generating a new board, from a fresh seed unless one is given."""
+        self.generate_board(seed=seed)
+    
+    def load_board(self, mine_positions):
+        """Start a new game on a pre-generated layout given as flat mine positions."""
+        self.generate_board(mine_positions)
@@ -0,0 +1,61 @@
+from functools import lru_cache
+import numpy as np
+
+# Neighbor order matches the row-major scan GameModel.get_neighbors has always used
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+NEIGHBOR_CACHE_SIZE = 16
+
+class NeighborTable:
+    def __init__(self, board_shape):
+        """Precompute neighbor offsets for a board shape, one set per edge class instead of one list per cell."""
+        self.board_shape = board_shape
+        rows, cols = board_shape
+        # A cell's edge class records which of its four sides have cells beyond them; the 16 classes
+        # cover every cell of any board, so the table stays the same size however large the board is
+        self.offsets = []
+        self.deltas = []
+        for edge in range(16):
+            up, down, left, right = edge & 8, edge & 4, edge & 2, edge & 1
+            offsets = tuple((dr, dc) for dr, dc in NEIGHBOR_OFFSETS
+                            if (dr >= 0 or up) and (dr <= 0 or down) and (dc >= 0 or left) and (dc <= 0 or right))
+            self.offsets.append(offsets)
+            self.deltas.append(np.array([dr * cols + dc for dr, dc in offsets], dtype=np.intp))
+    
+    def edge_class(self, row, col):
+        """Return the edge class of a cell."""
+        rows, cols = self.board_shape
+        return (row > 0) << 3 | (row < rows - 1) << 2 | (col > 0) << 1 | (col < cols - 1)
+    
+    def cells(self, row, col):
+        """Return the (row, col) neighbors of a cell."""
+        return [(row + dr, col + dc) for dr, dc in self.offsets[self.edge_class(row, col)]]
+    
+    def flat(self, row, col):
+        """Return the flat indices of a cell's neighbors."""
+        return self.deltas[self.edge_class(row, col)] + (row * self.board_shape[1] + col)
+    
+    def count(self, mask, rows, cols, boards=None):
+        """Return how many neighbors of each given cell are set in a bool mask, indexed by boards first for a batch."""
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        counts = np.zeros(rows.shape, dtype=np.int8)
+        for dr, dc in NEIGHBOR_OFFSETS:
+            nr, nc = rows + dr, cols + dc
+            inside = (nr >= 0) & (nr < self.board_shape[0]) & (nc >= 0) & (nc < self.board_shape[1])
+            if boards is None:
+                counts[inside] += mask[nr[inside], nc[inside]]
+            else:
+                counts[inside] += mask[boards[inside], nr[inside], nc[inside]]
+        return counts
+
+def count_neighbors(mines):
+    """Return the number of mines around each cell of a mine array, counting over its last two axes."""
+    padded = np.zeros((*mines.shape[:-2], mines.shape[-2] + 2, mines.shape[-1] + 2), dtype=np.int8)
+    padded[..., 1:-1, 1:-1] = mines
+    rows = padded[..., :-2] + padded[..., 1:-1] + padded[..., 2:]
+    return rows[..., :-2, :] + rows[..., 1:-1, :] + rows[..., 2:, :] - mines
+
+@lru_cache(maxsize=NEIGHBOR_CACHE_SIZE)
+def neighbor_table(board_shape):
+    """Return the NeighborTable for a board shape, shared by every board of that size."""
+    return NeighborTable(tuple(board_shape))
@@ -0,0 +1,120 @@
+import csv
+import json
+import time
+from collections import deque
+import numpy as np
+
+# Phases timed on each frame, as (phase, attribute of the scheduler that owns the method, method name)
+PHASES = [
+    ("events", None, "handle_events"),
+    ("reveal_cell", "model", "reveal_cell"),
+    ("flood_fill", "model", "flood_fill"),
+    ("chord_cell", "model", "chord_cell"),
+    ("check_win", "model", "check_win"),
+    ("draw_grid", "view", "draw_grid"),
+    ("draw_game_over_grid", "view", "draw_game_over_grid"),
+    ("draw_sidebar", "view", "draw_sidebar"),
+    ("display", None, "update_display"),
+]
+
+HISTORY_FRAMES = 600
+OVERLAY_REFRESH_MS = 250
+PERCENTILES = (50, 95, 99)
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY_FRAMES, keep_log=False):
+        """Time each phase of a frame, keeping the last history frames for rolling percentiles."""
+        self.history = history
+        self.samples = {phase: deque(maxlen=history) for phase, _, _ in PHASES}
+        self.samples["frame"] = deque(maxlen=history)
+        self.current = {}
+        self.depth = 0
+        self.frame_index = 0
+        self.log = [] if keep_log else None
+        self.view = None
+        self.overlay_time = 0
+    
+    def instrument(self, scheduler):
+        """Wrap the timed methods of a scheduler, its model and its view on the instances themselves."""
+        self.view = scheduler.view
+        owners = {None: scheduler, "model": scheduler.model, "view": scheduler.view}
+        for phase, owner, name in PHASES:
+            target = owners[owner]
+            if hasattr(target, name):
+                setattr(target, name, self.timed(phase, getattr(target, name)))
+    
+    def timed(self, phase, method):
+        """Return a wrapper that adds each call's duration to phase in the current frame."""
+        def wrapper(*args, **kwargs):
+            self.depth += 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                self.depth -= 1
+                self.current[phase] = self.current.get(phase, 0.0) + elapsed
+                if self.depth == 0:
+                    # Nested phases are already inside their caller's time, so only outermost calls make up the frame
+                    self.current["frame"] = self.current.get("frame", 0.0) + elapsed
+        return wrapper
+    
+    def end_frame(self):
+        """Close the current frame, adding its phase totals to the rolling history."""
+        for phase, elapsed in self.current.items():
+            self.samples[phase].append(elapsed)
+            if self.log is not None:
+                self.log.append((self.frame_index, phase, elapsed))
+        self.current = {}
+        self.frame_index += 1
+        
+        now = time.monotonic() * 1000
+        if self.view is None:
+            return
+        if now - self.overlay_time >= OVERLAY_REFRESH_MS or (self.view.show_overlay and self.view.overlay_lines is None):
+            self.overlay_time = now
+            self.view.overlay_lines = self.overlay_lines() if self.view.show_overlay else None
+    
+    def percentiles(self, phase):
+        """Return the rolling (p50, p95, p99) of a phase in milliseconds, or None before any sample."""
+        samples = self.samples[phase]
+        if not samples:
+            return None
+        return tuple(np.percentile(samples, PERCENTILES))
+    
+    def summary(self):
+        """Return count, mean, max and percentiles of every phase over the rolling history."""
+        summary = {}
+        for phase, samples in self.samples.items():
+            if not samples:
+                continue
+            values = np.fromiter(samples, dtype=float)
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            summary[phase] = {"count": len(values), "mean": values.mean(), "max": values.max(),
+                              "p50": p50, "p95": p95, "p99": p99}
+        return summary
+    
+    def overlay_lines(self):
+        """Return one line of overlay text per phase with its p50/p95/p99 in milliseconds."""
+        lines = []
+        for phase in ["frame"] + [phase for phase, _, _ in PHASES]:
+            result = self.percentiles(phase)
+            if result is None:
+                lines.append(f"{phase}: -")
+            else:
+                lines.append(f"{phase}: " + " / ".join(f"{value:.2f}" for value in result))
+        return lines
+    
+    def export(self, path):
+        """Write the summary and any per-frame log to path as JSON, or the per-frame log as CSV for .csv paths."""
+        rows = self.log if self.log is not None else []
+        if str(path).endswith(".csv"):
+            with open(path, "w", newline="") as stream:
+                writer = csv.writer(stream)
+                writer.writerow(["frame", "phase", "ms"])
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as stream:
+                json.dump({"summary": self.summary(),
+                           "frames": [{"frame": frame, "phase": phase, "ms": ms} for frame, phase, ms in rows]},
+                          stream, indent=2)
@@ -0,0 +1,220 @@
+import time
+import numpy as np
+from model import GameModel, REVEAL, FLAG, CHORD
+from chunked import ChunkedGameModel
+
+MAGIC = b"MSRP"
+VERSION = 2
+
+ACTION_NAMES = {REVEAL: "reveal", FLAG: "flag", CHORD: "chord"}
+
+# How the mine layout is stored: a packed mine bitmap, the seed of a ChunkedGameModel, or the seed
+# of a GameModel that placed its mines on the first reveal (version 2 and later)
+LAYOUT_MINES = 0
+LAYOUT_CHUNKED_SEED = 1
+LAYOUT_SEED = 2
+
+# Replay keeps a model snapshot every this many actions so seeking never replays from move zero
+SNAPSHOT_INTERVAL = 32
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    """Read an unsigned LEB128 varint, returning (value, next position)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def apply_action(model, kind, row, col):
+    """Apply one recorded action to a model."""
+    if kind == REVEAL:
+        model.reveal_cell(row, col)
+    elif kind == FLAG:
+        model.toggle_flag(row, col)
+    elif kind == CHORD:
+        model.chord_cell(row, col)
+
+class GameRecord:
+    def __init__(self, board_shape, num_mines, layout_kind, layout, actions=None, times=None):
+        """Hold one game: its board configuration, mine layout and timestamped actions."""
+        self.board_shape = board_shape
+        self.num_mines = num_mines
+        self.layout_kind = layout_kind
+        self.layout = layout
+        self.actions = actions if actions is not None else []
+        self.times = times if times is not None else []
+    
+    def make_model(self):
+        """Create a fresh model with this game's mine layout and no actions applied."""
+        if self.layout_kind == LAYOUT_CHUNKED_SEED:
+            return ChunkedGameModel(self.board_shape, self.num_mines, seed=self.layout)
+        if self.layout_kind == LAYOUT_SEED:
+            # Replaying the recorded first reveal places the mines exactly as in the original game
+            return GameModel(self.board_shape, self.num_mines, seed=self.layout)
+        return GameModel(self.board_shape, self.num_mines, mine_positions=np.flatnonzero(self.layout))
+    
+    def encode(self):
+        """Serialize the game to its compact binary form."""
+        out = bytearray()
+        rows, cols = self.board_shape
+        for value in (rows, cols, self.num_mines, self.layout_kind):
+            write_varint(out, value)
+        if self.layout_kind in (LAYOUT_CHUNKED_SEED, LAYOUT_SEED):
+            write_varint(out, self.layout)
+        else:
+            out += np.packbits(self.layout, axis=None).tobytes()
+        
+        write_varint(out, len(self.actions))
+        previous = 0
+        for (kind, row, col), ms in zip(self.actions, self.times):
+            write_varint(out, (row * cols + col) << 2 | kind)
+            write_varint(out, ms - previous)
+            previous = ms
+        return bytes(out)
+    
+    @classmethod
+    def decode(cls, payload):
+        """Rebuild a game from the bytes produced by encode()."""
+        rows, pos = read_varint(payload, 0)
+        cols, pos = read_varint(payload, pos)
+        num_mines, pos = read_varint(payload, pos)
+        layout_kind, pos = read_varint(payload, pos)
+        if layout_kind in (LAYOUT_CHUNKED_SEED, LAYOUT_SEED):
+            layout, pos = read_varint(payload, pos)
+        else:
+            size = rows * cols
+            packed = np.frombuffer(payload, dtype=np.uint8, count=(size + 7) // 8, offset=pos)
+            layout = np.unpackbits(packed, count=size).astype(bool).reshape(rows, cols)
+            pos += len(packed)
+        
+        count, pos = read_varint(payload, pos)
+        actions = []
+        times = []
+        ms = 0
+        for _ in range(count):
+            code, pos = read_varint(payload, pos)
+            delta, pos = read_varint(payload, pos)
+            ms += delta
+            cell = code >> 2
+            actions.append((code & 3, cell // cols, cell % cols))
+            times.append(ms)
+        return cls((rows, cols), num_mines, layout_kind, layout, actions, times)
+
+def write_game(stream, record):
+    """Write one length-prefixed game record to a binary stream."""
+    payload = record.encode()
+    header = bytearray(MAGIC)
+    header.append(VERSION)
+    write_varint(header, len(payload))
+    stream.write(header)
+    stream.write(payload)
+
+def append_game(path, record):
+    """Append one game to a replay file, which may hold any number of games back to back."""
+    with open(path, "ab") as stream:
+        write_game(stream, record)
+
+def iter_games(path):
+    """Stream the games of a replay file one at a time without loading the whole file."""
+    with open(path, "rb") as stream:
+        while True:
+            header = stream.read(len(MAGIC) + 1)
+            if not header:
+                return
+            if header[:len(MAGIC)] != MAGIC or not 1 <= header[-1] <= VERSION:
+                raise ValueError(f"{path}: not a replay record of version {VERSION} or earlier")
+            length = 0
+            shift = 0
+            while True:
+                byte = stream.read(1)[0]
+                length |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            yield GameRecord.decode(stream.read(length))
+
+class GameRecorder:
+    def __init__(self, path=None):
+        """Record the actions of each game, appending finished games to path when one is given."""
+        self.path = path
+        self.record = None
+        self.start = None
+    
+    def begin(self, model):
+        """Start recording a new game on the model's current board."""
+        if isinstance(model, ChunkedGameModel):
+            self.record = GameRecord(model.board_shape, model.num_mines, LAYOUT_CHUNKED_SEED, model.seed)
+        elif model.board is None:
+            self.record = GameRecord(model.board_shape, model.num_mines, LAYOUT_SEED, model.seed)
+        else:
+            self.record = GameRecord(model.board_shape, model.num_mines, LAYOUT_MINES, model.board == -1)
+        self.start = None
+    
+    def log(self, kind, row, col):
+        """Record an action, timestamped in milliseconds since the game's first action."""
+        if self.record is None:
+            return
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        self.record.actions.append((kind, int(row), int(col)))
+        self.record.times.append(int((now - self.start) * 1000))
+    
+    def finish(self):
+        """Close the current game, saving it if a path is set, and return its record."""
+        record = self.record
+        self.record = None
+        if record is not None and record.actions and self.path:
+            append_game(self.path, record)
+        return record
+
+class Replay:
+    def __init__(self, record, snapshot_interval=SNAPSHOT_INTERVAL):
+        """Replay a recorded game headlessly, with snapshots for fast seeking."""
+        self.record = record
+        self.snapshot_interval = snapshot_interval
+        self.model = record.make_model()
+        self.position = 0
+        self.snapshots = {0: self.model.snapshot()}
+    
+    def __len__(self):
+        """Return the number of recorded actions."""
+        return len(self.record.actions)
+    
+    def seek(self, index):
+        """Return the model as it was after the first index actions."""
+        index = max(0, min(index, len(self)))
+        if index < self.position or index - self.position > self.snapshot_interval:
+            # Jump to the nearest snapshot at or before the target, then play forward
+            start = max(position for position in self.snapshots if position <= index)
+            if index < self.position or start > self.position:
+                self.model.restore(self.snapshots[start])
+                self.position = start
+        
+        while self.position < index:
+            kind, row, col = self.record.actions[self.position]
+            apply_action(self.model, kind, row, col)
+            self.position += 1
+            if self.position % self.snapshot_interval == 0 and self.position not in self.snapshots:
+                self.snapshots[self.position] = self.model.snapshot()
+        
+        if self.model.game_over and index:
+            self.model.final_time = self.record.times[index - 1] / 1000
+        return self.model
+    
+    def states(self):
+        """Fast-forward through the whole game, yielding (action, model) after each step."""
+        self.seek(0)
+        for index, action in enumerate(self.record.actions, start=1):
+            yield action, self.seek(index)
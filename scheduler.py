@@ -0,0 +1,67 @@
+import math
+import pygame as g
+from profiler import OVERLAY_REFRESH_MS
+
+# Never redraw the running timer more often than this, about 60 FPS
+FRAME_INTERVAL_MS = 16
+LOW_POWER_TIMER_RESOLUTION = 1.0
+
+class FrameScheduler:
+    def __init__(self, controller, view, low_power=False, profiler=None):
+        """Drive the game loop from events, redrawing only when input or the visible timer changes."""
+        self.controller = controller
+        self.view = view
+        self.model = controller.model
+        if low_power:
+            self.view.timer_resolution = LOW_POWER_TIMER_RESOLUTION
+        self.profiler = profiler
+        self.warming = True
+        if profiler:
+            profiler.instrument(self)
+    
+    def timer_timeout(self):
+        """Return the milliseconds until the sidebar timer text next changes, or None while it is stopped."""
+        if not self.model.game_started or self.model.game_over:
+            return None
+        step = self.view.timer_resolution
+        remaining = step - self.model.get_elapsed_time() % step
+        return max(FRAME_INTERVAL_MS, math.ceil(remaining * 1000))
+    
+    def next_timeout(self):
+        """Return how long to wait for input before something on screen changes on its own."""
+        timeouts = [t for t in (self.timer_timeout(), self.controller.peek_timeout()) if t is not None]
+        if self.profiler and self.view.show_overlay:
+            timeouts.append(OVERLAY_REFRESH_MS)
+        return min(timeouts) if timeouts else None
+    
+    def wait(self):
+        """Block until an event arrives or the next timed change is due, returning NOEVENT on a timeout."""
+        if self.warming:
+            # Idle passes finish the deferred sprites one at a time, so input is never held up for long
+            self.warming = self.view.warm_up()
+            return g.event.poll()
+        timeout = self.next_timeout()
+        return g.event.wait(timeout) if timeout is not None else g.event.wait()
+    
+    def handle_events(self, event):
+        """Handle the event that ended the wait and everything queued behind it."""
+        if event.type != g.NOEVENT:
+            self.controller.handle_event(event)
+        self.controller.process_events()
+    
+    def update_display(self, dirty):
+        """Push the dirty rects of a frame to the display."""
+        g.display.update(dirty)
+    
+    def run(self, on_first_frame=None):
+        """Run until the controller stops, pushing only the dirty rects of each frame to the display."""
+        while self.controller.running:
+            dirty = self.view.render(self.controller)
+            if dirty:
+                self.update_display(dirty)
+            if on_first_frame:
+                on_first_frame()
+                on_first_frame = None
+            if self.profiler:
+                self.profiler.end_frame()
+            self.handle_events(self.wait())
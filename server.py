@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import itertools
+import time
+from model import GameModel, REVEAL, FLAG, CHORD
+
+# One command per line, one reply line per command:
+#   NEW <rows> <cols> <mines>        -> NEW <session>
+#   ACT <session> <action>...        -> D <status> <cell>=<code>...
+#   BOARD <session>                  -> D <status> <cell>=<code>...   (every revealed or flagged cell)
+#   END <session>                    -> END <session>
+# An action is r, f or c (reveal, flag, chord) followed by row,col, e.g. "ACT 7 r3,4 f5,6".
+# A D reply carries the status (playing, won or lost) and the cells the command changed, as flat
+# indices with their value, f for a flag or h for hidden. Errors reply "ERR <reason>".
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SESSION_TIMEOUT = 300
+REAP_INTERVAL = 30
+MAX_SESSIONS = 10_000
+# Larger boards belong to the chunked model, which the server does not host
+MAX_BOARD_CELLS = 250_000
+MAX_LINE = 64 * 1024
+
+ACTION_CODES = {"r": REVEAL, "f": FLAG, "c": CHORD}
+
+def cell_code(value, flagged):
+    """Return the protocol code of a cell: its revealed value, f for a flag or h for hidden."""
+    if flagged:
+        return "f"
+    if value == -2:
+        return "h"
+    return str(value)
+
+def status_of(model):
+    """Return playing, won or lost for a model."""
+    if not model.game_over:
+        return "playing"
+    return "won" if model.game_won else "lost"
+
+def encode_cells(model, cells, values, flags):
+    """Format a delta reply listing each changed flat cell index with its new code."""
+    parts = [f"{cell}={cell_code(value, flagged)}" for cell, value, flagged in zip(cells.tolist(), values.tolist(), flags.tolist())]
+    return " ".join(["D", status_of(model), *parts])
+
+def parse_actions(tokens):
+    """Parse action tokens like r3,4 f5,6 c3,4 into (kind, row, col) tuples."""
+    actions = []
+    for token in tokens:
+        row, _, col = token[1:].partition(",")
+        if token[0] not in ACTION_CODES or not row or not col:
+            raise ValueError(f"bad action {token!r}")
+        actions.append((ACTION_CODES[token[0]], int(row), int(col)))
+    return actions
+
+class Session:
+    def __init__(self, model):
+        """Hold one hosted game and when it was last used."""
+        self.model = model
+        self.last_used = time.monotonic()
+
+class GameServer:
+    def __init__(self, session_timeout=SESSION_TIMEOUT, max_sessions=MAX_SESSIONS):
+        """Host many GameModel sessions behind a line-delimited text protocol."""
+        self.session_timeout = session_timeout
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.actions_served = 0
+        self.reaper_task = None
+    
+    def new_session(self, rows, cols, mines):
+        """Create a session and return its id."""
+        if not (0 < rows and 0 < cols and rows * cols <= MAX_BOARD_CELLS and 0 <= mines < rows * cols):
+            raise ValueError("bad board configuration")
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("too many sessions")
+        session_id = next(self.ids)
+        self.sessions[session_id] = Session(GameModel((rows, cols), mines))
+        return session_id
+    
+    def session(self, session_id):
+        """Return a live session by id, marking it as used."""
+        session = self.sessions.get(int(session_id))
+        if session is None:
+            raise ValueError("unknown session")
+        session.last_used = time.monotonic()
+        return session
+    
+    def handle_line(self, line):
+        """Execute one protocol command and return its reply line."""
+        tokens = line.split()
+        if not tokens:
+            raise ValueError("empty command")
+        command = tokens[0].upper()
+        if command == "NEW" and len(tokens) == 4:
+            return f"NEW {self.new_session(*map(int, tokens[1:]))}"
+        if command == "ACT" and len(tokens) >= 3:
+            model = self.session(tokens[1]).model
+            actions = parse_actions(tokens[2:])
+            delta = model.apply_actions(actions)
+            self.actions_served += len(actions)
+            return encode_cells(model, delta.cells, delta.values, delta.flags)
+        if command == "BOARD" and len(tokens) == 2:
+            # Full state for clients that (re)attach to a session: every revealed or flagged cell
+            model = self.session(tokens[1]).model
+            user = model.user_board.ravel()
+            flags = model.flag_board.ravel()
+            cells = (user != -2) | flags
+            return encode_cells(model, cells.nonzero()[0], user[cells], flags[cells])
+        if command == "END" and len(tokens) == 2:
+            self.sessions.pop(int(tokens[1]), None)
+            return f"END {tokens[1]}"
+        raise ValueError(f"bad command {tokens[0]!r}")
+    
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client disconnects."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = self.handle_line(line.decode("ascii"))
+                except (ValueError, UnicodeDecodeError) as error:
+                    reply = f"ERR {error}"
+                writer.write(reply.encode("ascii") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    def reap(self):
+        """Drop sessions idle for longer than the timeout and return how many were removed."""
+        cutoff = time.monotonic() - self.session_timeout
+        idle = [session_id for session_id, session in self.sessions.items() if session.last_used < cutoff]
+        for session_id in idle:
+            del self.sessions[session_id]
+        return len(idle)
+    
+    async def reaper(self, interval=REAP_INTERVAL):
+        """Periodically drop idle sessions."""
+        while True:
+            await asyncio.sleep(interval)
+            self.reap()
+    
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening and reaping, returning the asyncio server."""
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        self.reaper_task = asyncio.create_task(self.reaper())
+        return server
+    
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Serve until cancelled."""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    """Run the game server from the command line."""
+    parser = argparse.ArgumentParser(description="Host Minesweeper sessions over a line protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--timeout", type=float, default=SESSION_TIMEOUT, help="seconds before an idle session is dropped")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer(args.timeout, args.max_sessions).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+import argparse
+import math
+import time
+from functools import lru_cache
+import numpy as np
+from model import GameModel
+from neighbors import NEIGHBOR_CACHE_SIZE, neighbor_table
+
+DIFFICULTIES = {
+    "beginner": ((9, 9), 10),
+    "intermediate": ((16, 16), 40),
+    "expert": ((16, 30), 99),
+}
+
+# Frontier components larger than this, or needing more backtracking steps, are treated as unknown
+ENUMERATION_MAX_CELLS = 64
+ENUMERATION_BUDGET = 100_000
+
+@lru_cache(maxsize=NEIGHBOR_CACHE_SIZE)
+def neighbor_lists(board_shape):
+    """Return a tuple of flat neighbor indices for every cell of a board shape, shared by every solver of that size."""
+    table = neighbor_table(board_shape)
+    rows, cols = board_shape
+    return tuple(tuple(table.flat(row, col).tolist()) for row in range(rows) for col in range(cols))
+
+def frontier_components(constraints):
+    """Split constraints into groups that share no unknown cells, returning (cells, constraints) pairs."""
+    parent = {}
+    
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+    
+    for unknown, _ in constraints:
+        first = None
+        for cell in unknown:
+            parent.setdefault(cell, cell)
+            if first is None:
+                first = find(cell)
+            else:
+                parent[find(cell)] = first
+    
+    groups = {}
+    for unknown, remaining in constraints:
+        root = find(next(iter(unknown)))
+        groups.setdefault(root, []).append((unknown, remaining))
+    
+    components = []
+    for group in groups.values():
+        cells = sorted(set().union(*(unknown for unknown, _ in group)))
+        components.append((cells, group))
+    return components
+
+def enumerate_component(cells, constraints, budget=ENUMERATION_BUDGET):
+    """Count a component's valid mine layouts as {mines: (layouts, {cell: mine count})}, or None if too large."""
+    # Order cells so each constraint closes as soon as possible, which keeps pruning effective
+    order = []
+    seen = set()
+    for unknown, _ in sorted(constraints, key=lambda c: len(c[0])):
+        for cell in sorted(unknown):
+            if cell not in seen:
+                seen.add(cell)
+                order.append(cell)
+    position = {cell: i for i, cell in enumerate(order)}
+    
+    count = len(order)
+    need = [remaining for _, remaining in constraints]
+    left = [len(unknown) for unknown, _ in constraints]
+    touching = [[] for _ in range(count)]
+    for ci, (unknown, _) in enumerate(constraints):
+        for cell in unknown:
+            touching[position[cell]].append(ci)
+    
+    layouts = {}
+    steps = 0
+    
+    def assign(i, mine):
+        ok = True
+        for ci in touching[i]:
+            left[ci] -= 1
+            need[ci] -= mine
+            if need[ci] < 0 or need[ci] > left[ci]:
+                ok = False
+        return ok
+    
+    def unassign(i, mine):
+        for ci in touching[i]:
+            left[ci] += 1
+            need[ci] += mine
+    
+    def visit(i, mask, mines):
+        nonlocal steps
+        steps += 1
+        if steps > budget:
+            raise OverflowError
+        if i == count:
+            layouts.setdefault(mines, []).append(mask)
+            return
+        for mine in (0, 1):
+            if assign(i, mine):
+                visit(i + 1, mask | (mine << i), mines + mine)
+            unassign(i, mine)
+    
+    if count > ENUMERATION_MAX_CELLS:
+        return None
+    try:
+        visit(0, 0, 0)
+    except OverflowError:
+        return None
+    
+    bits = np.arange(count, dtype=np.uint64)
+    result = {}
+    for mines, masks in layouts.items():
+        per_cell = ((np.array(masks, dtype=np.uint64)[:, None] >> bits) & np.uint64(1)).sum(axis=0)
+        result[mines] = (len(masks), dict(zip(order, per_cell.tolist())))
+    return result
+
+def convolve(a, b):
+    """Multiply two mine-count polynomials stored as {mines: layouts} dicts."""
+    out = {}
+    for ka, va in a.items():
+        for kb, vb in b.items():
+            out[ka + kb] = out.get(ka + kb, 0) + va * vb
+    return out
+
+def combine_components(solved, interior, mines_left):
+    """Weight component layouts by the ways to fit the remaining mines in the interior, returning cell and interior probabilities."""
+    polys = [{k: layouts for k, (layouts, _) in result.items()} for result in solved]
+    
+    def weight(poly, extra):
+        total = 0
+        for k, layouts in poly.items():
+            rest = mines_left - k - extra
+            if 0 <= rest <= interior:
+                total += layouts * math.comb(interior, rest)
+        return total
+    
+    everything = {0: 1}
+    for poly in polys:
+        everything = convolve(everything, poly)
+    total = weight(everything, 0)
+    if total == 0:
+        return [{} for _ in solved], 0.0
+    
+    probabilities = []
+    for j, result in enumerate(solved):
+        others = {0: 1}
+        for i, poly in enumerate(polys):
+            if i != j:
+                others = convolve(others, poly)
+        cells = {}
+        for k, (_, per_cell) in result.items():
+            w = weight(others, k)
+            if w == 0:
+                continue
+            for cell, mines in per_cell.items():
+                cells[cell] = cells.get(cell, 0) + mines * w
+        probabilities.append({cell: cells.get(cell, 0) / total for cell in result[next(iter(result))][1]})
+    
+    interior_probability = 0.0
+    if interior:
+        expected = 0
+        for k, layouts in everything.items():
+            rest = mines_left - k
+            if 0 <= rest <= interior:
+                expected += layouts * math.comb(interior, rest) * rest
+        interior_probability = expected / total / interior
+    return probabilities, interior_probability
+
+class Solver:
+    def __init__(self, board_shape, num_mines):
+        """Initialize a solver for a board it can only see through user_board and flag_board."""
+        self.board_shape = board_shape
+        self.num_mines = num_mines
+        self.size = board_shape[0] * board_shape[1]
+        self.neighbors = neighbor_lists(board_shape)
+        
+        self.user = np.full(self.size, -2, dtype=np.int8)
+        self.flags = np.zeros(self.size, dtype=bool)
+        self.values = [-2] * self.size
+        self.flagged = [False] * self.size
+        self.flag_count = 0
+        
+        self.constraints = {}
+        self.dirty = set()
+        self.safe = set()
+        self.mines = set()
+    
+    def update(self, user_board, flag_board):
+        """Absorb the cells that changed since the last update and requeue the constraints around them."""
+        user = user_board.ravel()
+        flags = flag_board.ravel()
+        changed = np.flatnonzero((user != self.user) | (flags != self.flags)).tolist()
+        if not changed:
+            return
+        self.user[changed] = user[changed]
+        self.flags[changed] = flags[changed]
+        
+        touched = set()
+        unflagged = False
+        for cell in changed:
+            value = int(user[cell])
+            self.values[cell] = value
+            if self.flagged[cell] != bool(flags[cell]):
+                self.flag_count += 1 if flags[cell] else -1
+                self.flagged[cell] = bool(flags[cell])
+                unflagged |= not flags[cell]
+            self.safe.discard(cell)
+            self.mines.discard(cell)
+            touched.add(cell)
+            touched.update(self.neighbors[cell])
+        
+        if unflagged:
+            # Deductions anywhere may have rested on a removed flag, so they are all derived again
+            self.safe.clear()
+            self.mines.clear()
+            self.dirty.update(self.constraints)
+        for cell in touched:
+            if self.values[cell] > 0:
+                self.dirty.add(cell)
+            else:
+                self.constraints.pop(cell, None)
+    
+    def is_unknown(self, cell):
+        """Return whether a cell is hidden and not flagged."""
+        return self.values[cell] == -2 and not self.flagged[cell]
+    
+    def refresh_constraint(self, cell):
+        """Recompute the constraint of a numbered cell from the cells around it."""
+        unknown = []
+        remaining = self.values[cell]
+        for neighbor in self.neighbors[cell]:
+            if self.flagged[neighbor]:
+                remaining -= 1
+            elif self.values[neighbor] == -2:
+                unknown.append(neighbor)
+        if unknown:
+            self.constraints[cell] = (frozenset(unknown), remaining)
+        else:
+            self.constraints.pop(cell, None)
+        return self.constraints.get(cell)
+    
+    def nearby_constraints(self, unknown):
+        """Return the constraint cells that share at least one unknown cell with the given set."""
+        nearby = set()
+        for cell in unknown:
+            for neighbor in self.neighbors[cell]:
+                if neighbor in self.constraints:
+                    nearby.add(neighbor)
+        return nearby
+    
+    def propagate(self):
+        """Apply the single-cell and subset rules to every constraint queued since the last call."""
+        while self.dirty:
+            for cell in list(self.dirty):
+                self.refresh_constraint(cell)
+            queue = [cell for cell in self.dirty if cell in self.constraints]
+            self.dirty = set()
+            
+            for cell in queue:
+                constraint = self.constraints.get(cell)
+                if constraint is None:
+                    continue
+                unknown, remaining = constraint
+                if remaining == 0:
+                    self.safe.update(unknown)
+                    continue
+                if remaining == len(unknown):
+                    self.mines.update(unknown)
+                    continue
+                
+                for other in self.nearby_constraints(unknown):
+                    if other == cell:
+                        continue
+                    other_unknown, other_remaining = self.constraints[other]
+                    if unknown < other_unknown:
+                        self.apply_difference(other_unknown - unknown, other_remaining - remaining)
+                    elif other_unknown < unknown:
+                        self.apply_difference(unknown - other_unknown, remaining - other_remaining)
+    
+    def apply_difference(self, cells, mines):
+        """Record the outcome of a subset rule: cells holding exactly the given number of mines."""
+        if mines == 0:
+            self.safe.update(cells)
+        elif mines == len(cells):
+            self.mines.update(cells)
+    
+    def probabilities(self):
+        """Enumerate the frontier and return ({cell: mine probability}, interior probability, interior cells)."""
+        constraints = list(self.constraints.values())
+        frontier = set().union(*(unknown for unknown, _ in constraints)) if constraints else set()
+        unknown_cells = [cell for cell in range(self.size) if self.is_unknown(cell)]
+        interior = [cell for cell in unknown_cells if cell not in frontier]
+        mines_left = self.num_mines - self.flag_count
+        
+        solved = []
+        unsolved = []
+        for cells, group in frontier_components(constraints):
+            result = enumerate_component(cells, group)
+            if result:
+                solved.append(result)
+            else:
+                unsolved.extend(cells)
+        
+        # Components too large to enumerate are folded into the interior as an approximation
+        component_probabilities, interior_probability = combine_components(solved, len(interior) + len(unsolved), mines_left)
+        probabilities = {}
+        for result in component_probabilities:
+            probabilities.update(result)
+        for cell in unsolved:
+            probabilities[cell] = interior_probability
+        return probabilities, interior_probability, interior
+    
+    def next_moves(self):
+        """Return (safe cells, mine cells) that are certain, enumerating the frontier only if the rules find nothing."""
+        self.propagate()
+        self.safe = {cell for cell in self.safe if self.is_unknown(cell)}
+        self.mines = {cell for cell in self.mines if self.is_unknown(cell)}
+        if self.safe or self.mines:
+            return self.safe, self.mines
+        
+        probabilities, interior_probability, interior = self.probabilities()
+        for cell, probability in probabilities.items():
+            if probability == 0:
+                self.safe.add(cell)
+            elif probability == 1:
+                self.mines.add(cell)
+        if interior and interior_probability == 0:
+            self.safe.update(interior)
+        elif interior and interior_probability == 1:
+            self.mines.update(interior)
+        return self.safe, self.mines
+    
+    def best_guess(self):
+        """Return the unknown cell least likely to hold a mine."""
+        probabilities, interior_probability, interior = self.probabilities()
+        best = min(probabilities, key=probabilities.get, default=None)
+        if best is None or (interior and interior_probability < probabilities[best]):
+            best = interior[0]
+        return best
+
+def play_game(model, first_move=(0, 0), max_guesses=None):
+    """Play a GameModel to the end with the solver and return (won, guesses), giving up once more than max_guesses are needed."""
+    solver = Solver(model.board_shape, model.num_mines)
+    cols = model.board_shape[1]
+    guesses = 0
+    model.reveal_cell(*first_move)
+    
+    while not model.game_over:
+        solver.update(model.user_board, model.flag_board)
+        safe, mines = solver.next_moves()
+        if not safe and not mines:
+            if max_guesses is not None and guesses >= max_guesses:
+                return False, guesses
+            cell = solver.best_guess()
+            guesses += 1
+            model.reveal_cell(cell // cols, cell % cols)
+            continue
+        
+        for cell in list(mines):
+            model.toggle_flag(cell // cols, cell % cols)
+        for cell in list(safe):
+            model.reveal_cell(cell // cols, cell % cols)
+            if model.game_over:
+                break
+    return model.game_won, guesses
+
+def benchmark(games, difficulties=tuple(DIFFICULTIES), seed=0):
+    """Play games per difficulty and return a list of result rows with games/s and solve rate."""
+    rows = []
+    for name in difficulties:
+        board_shape, num_mines = DIFFICULTIES[name]
+        seeds = np.random.SeedSequence(seed).generate_state(games, dtype=np.uint64)
+        model = GameModel(board_shape, num_mines)
+        wins = 0
+        guesses = 0
+        start = time.perf_counter()
+        for game_seed in seeds.tolist():
+            model.restart(game_seed)
+            won, guessed = play_game(model)
+            wins += won
+            guesses += guessed
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "difficulty": name,
+            "games": games,
+            "games_per_second": games / elapsed,
+            "solve_rate": wins / games,
+            "guesses_per_game": guesses / games,
+        })
+    return rows
+
+def main():
+    """Run the solver benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper auto-player.")
+    parser.add_argument("--games", type=int, default=200, help="games to play per difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="seed for board generation")
+    parser.add_argument("difficulties", nargs="*", help=f"any of {', '.join(DIFFICULTIES)} (default: all)")
+    args = parser.parse_args()
+    for name in args.difficulties:
+        if name not in DIFFICULTIES:
+            parser.error(f"unknown difficulty {name!r}")
+    
+    print(f"{'difficulty':<14}{'games':>8}{'games/s':>10}{'solved':>9}{'guesses':>9}")
+    for row in benchmark(args.games, args.difficulties or tuple(DIFFICULTIES), args.seed):
+        print(f"{row['difficulty']:<14}{row['games']:>8}{row['games_per_second']:>10.1f}"
+              f"{row['solve_rate']:>9.1%}{row['guesses_per_game']:>9.2f}")
+
+if __name__ == "__main__":
+    main()
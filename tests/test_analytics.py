@@ -0,0 +1,62 @@
+import numpy as np
+from analytics import board_metrics, read_columns, score_corpus, score_seeds
+from model import GameModel
+from neighbors import count_neighbors
+
+def reference_metrics(board):
+    """Return 3BV, openings, largest opening and isolated numbers of one board by walking its empty regions."""
+    rows, cols = board.shape
+    seen = np.zeros(board.shape, dtype=bool)
+    sizes = []
+    for row, col in np.argwhere(board == 0).tolist():
+        if seen[row, col]:
+            continue
+        seen[row, col] = True
+        stack = [(row, col)]
+        size = 0
+        while stack:
+            r, c = stack.pop()
+            size += 1
+            for nr in range(max(0, r - 1), min(rows, r + 2)):
+                for nc in range(max(0, c - 1), min(cols, c + 2)):
+                    if board[nr, nc] == 0 and not seen[nr, nc]:
+                        seen[nr, nc] = True
+                        stack.append((nr, nc))
+        sizes.append(size)
+    isolated = sum(1 for r, c in np.argwhere(board > 0).tolist()
+                   if not (board[max(0, r - 1):r + 2, max(0, c - 1):c + 2] == 0).any())
+    return len(sizes) + isolated, len(sizes), max(sizes, default=0), isolated
+
+def test_scores_the_boards_game_model_deals():
+    start = (8, 15)
+    columns = score_seeds((16, 30), 99, start, 100, 50, solve=False)
+    boards = []
+    for seed in range(100, 150):
+        model = GameModel((16, 30), 99, seed=seed)
+        model.reveal_cell(*start)
+        boards.append(model.board)
+    bbbv, openings, largest, isolated = board_metrics(np.array(boards))
+    assert np.array_equal(columns["seed"], np.arange(100, 150))
+    assert np.array_equal(columns["bbbv"], bbbv)
+    assert np.array_equal(columns["openings"], openings)
+    assert np.array_equal(columns["largest_opening"], largest)
+    assert np.array_equal(columns["isolated"], isolated)
+
+def test_metrics_match_a_walk_of_each_board():
+    rng = np.random.default_rng(0)
+    for density in (0.0, 0.05, 0.15, 0.3, 1.0):
+        mines = rng.random((40, 12, 17)) < density
+        boards = np.where(mines, np.int8(-1), count_neighbors(mines))
+        metrics = np.array(board_metrics(boards)).T
+        for board, row in zip(boards, metrics.tolist()):
+            assert tuple(row) == reference_metrics(board)
+
+def test_corpus_is_written_in_seed_order(tmp_path):
+    directory = str(tmp_path / "corpus")
+    assert score_corpus(directory, (9, 9), 10, 500, 50, solve=False, workers=1, task_seeds=15) == 50
+    meta, columns = read_columns(directory)
+    assert meta["rows"] == 50 and meta["start"] == [4, 4]
+    expected = score_seeds((9, 9), 10, (4, 4), 500, 50, solve=False)
+    assert set(columns) == set(expected)
+    for name, values in expected.items():
+        assert np.array_equal(columns[name], values)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from batch import BatchModel
+from model import GameModel
+
+NUM_BOARDS = 20
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_game_model(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = (int(size) for size in rng.integers(2, 14, 2))
+    num_mines = int(rng.integers(0, rows * cols // 3 + 1))
+    batch = BatchModel(NUM_BOARDS, (rows, cols), num_mines, seed=seed)
+    models = [GameModel((rows, cols), num_mines, mine_positions=np.flatnonzero(board == -1)) for board in batch.board]
+    
+    for _ in range(30):
+        # Each step applies one kind of action to random boards, including cells just off the edge
+        boards = rng.integers(0, NUM_BOARDS, 40)
+        cell_rows = rng.integers(-1, rows + 1, 40)
+        cell_cols = rng.integers(-1, cols + 1, 40)
+        action = int(rng.integers(0, 3))
+        (batch.reveal, batch.toggle_flag, batch.chord)[action](boards, cell_rows, cell_cols)
+        for board, row, col in zip(boards.tolist(), cell_rows.tolist(), cell_cols.tolist()):
+            model = models[board]
+            if not model.game_over:
+                (model.reveal_cell, model.toggle_flag, model.chord_cell)[action](row, col)
+        
+        for i, model in enumerate(models):
+            assert np.array_equal(batch.user_board[i], model.user_board)
+            assert np.array_equal(batch.flag_board[i], model.flag_board)
+            assert (batch.game_over[i], batch.game_won[i]) == (model.game_over, model.game_won)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from chunked import ChunkedGameModel
+from model import GameModel
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_game_model(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = (int(size) for size in rng.integers(60, 160, 2))
+    num_mines = int(rows * cols * rng.uniform(0.02, 0.2))
+    # Reading the whole board materializes every chunk, so the game itself is played on a fresh model
+    board = ChunkedGameModel((rows, cols), num_mines, seed=seed).window("board", slice(None), slice(None))
+    model = GameModel((rows, cols), num_mines, mine_positions=np.flatnonzero(board == -1))
+    chunked = ChunkedGameModel((rows, cols), num_mines, seed=seed)
+    
+    for step in range(200):
+        row, col = int(rng.integers(0, rows)), int(rng.integers(0, cols))
+        action = int(rng.integers(0, 4))
+        # Mines are only flagged until the end, so the game lasts long enough to open many chunks
+        if action == 0 or board[row, col] == -1:
+            model.toggle_flag(row, col)
+            chunked.toggle_flag(row, col)
+        elif action == 1:
+            model.chord_cell(row, col)
+            chunked.chord_cell(row, col)
+        else:
+            model.reveal_cell(row, col)
+            chunked.reveal_cell(row, col)
+        
+        if step % 20 == 19:
+            assert np.array_equal(chunked.user_board[:, :], model.user_board)
+            assert np.array_equal(chunked.flag_board[:, :], model.flag_board)
+            assert (chunked.game_over, chunked.game_won) == (model.game_over, model.game_won)
+    
+    row, col = np.argwhere((board == -1) & ~model.flag_board)[0].tolist()
+    model.reveal_cell(row, col)
+    chunked.reveal_cell(row, col)
+    assert np.array_equal(chunked.user_board[:, :], model.user_board)
+    assert chunked.game_over and model.game_over and not chunked.game_won
+
+def test_splits_mines_on_boards_past_the_sampler_limit():
+    model = ChunkedGameModel((100_000, 100_000), 1_500_000_000, seed=1)
+    assert model.chunk_mines.sum() == 1_500_000_000
+    # Full chunks hold 15% mines on average, so none should stray far from it
+    assert np.all(np.abs(model.chunk_mines[:-1, :-1] - 614) < 150)
+    model.reveal_cell(50_000, 50_000)
+    assert model.revealed_count >= 1
@@ -0,0 +1,60 @@
+import numpy as np
+from chunked import ChunkedGameModel
+from controller import GameController
+from history import GameHistory
+from model import GameModel
+from replay import CHORD, GameRecorder, Replay
+
+class CellView:
+    def cell_at(self, mouse_x, mouse_y):
+        """Treat mouse coordinates as (row, col) directly."""
+        return mouse_x, mouse_y
+
+def chord_somewhere(controller, board):
+    """Flag the mines around a revealed number that still has hidden safe neighbors, then chord it."""
+    model = controller.model
+    user = model.user_board[:, :]
+    flags = model.flag_board[:, :]
+    for row, col in np.argwhere(user > 0).tolist():
+        top, left = max(0, row - 1), max(0, col - 1)
+        area = (slice(top, row + 2), slice(left, col + 2))
+        if np.any((user[area] == -2) & (board[area] != -1)):
+            for r, c in np.argwhere((board[area] == -1) & ~flags[area]).tolist():
+                controller.handle_cell_right_click(top + r, left + c)
+            controller.handle_cell_click(row, col)
+            return row, col
+    return None
+
+def test_chords_that_change_nothing_are_not_recorded(tmp_path):
+    model = GameModel((16, 30), 99, seed=4)
+    history = GameHistory(str(tmp_path / "history.sqlite3"))
+    controller = GameController(model, CellView(), history=history)
+    controller.handle_cell_click(8, 15)
+    assert history.clicks == 1
+    # Without flags around it a number cannot be chorded
+    row, col = np.argwhere(model.user_board > 0)[0].tolist()
+    controller.handle_cell_click(row, col)
+    assert history.clicks == 1
+    
+    # Chording the same number again finds nothing left to open
+    row, col = chord_somewhere(controller, model.board)
+    clicks = history.clicks
+    controller.handle_cell_click(row, col)
+    assert history.clicks == clicks
+    history.close()
+
+def test_chunked_chords_are_recorded_and_replayed():
+    model = ChunkedGameModel((300, 300), 9000, seed=6)
+    board = ChunkedGameModel((300, 300), 9000, seed=6).window("board", slice(None), slice(None))
+    recorder = GameRecorder()
+    controller = GameController(model, CellView(), recorder=recorder)
+    row, col = np.argwhere(board == 0)[0].tolist()
+    controller.handle_cell_click(row, col)
+    for _ in range(10):
+        assert chord_somewhere(controller, board) is not None
+    
+    record = recorder.record
+    assert sum(kind == CHORD for kind, _, _ in record.actions) == 10
+    replayed = Replay(record).seek(len(record.actions))
+    assert np.array_equal(replayed.user_board[:, :], model.user_board[:, :])
+    assert np.array_equal(replayed.flag_board[:, :], model.flag_board[:, :])
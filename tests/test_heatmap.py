@@ -0,0 +1,95 @@
+from itertools import combinations
+import numpy as np
+from model import GameModel
+from heatmap import Heatmap
+from solver import Solver
+
+def play_until_over(model, first_move):
+    """Play a game to the end with the solver, guessing when it has to."""
+    solver = Solver(model.board_shape, model.num_mines)
+    cols = model.board_shape[1]
+    model.reveal_cell(*first_move)
+    while not model.game_over:
+        solver.update(model.user_board, model.flag_board)
+        safe, mines = solver.next_moves()
+        if not safe and not mines:
+            model.reveal_cell(*divmod(solver.best_guess(), cols))
+            continue
+        for cell in list(mines):
+            model.toggle_flag(*divmod(cell, cols))
+        for cell in list(safe):
+            model.reveal_cell(*divmod(cell, cols))
+            if model.game_over:
+                break
+
+def test_restart_clears_previous_deductions():
+    for seed in range(10):
+        model = GameModel((16, 30), 99, seed=seed)
+        heatmap = Heatmap(model.board_shape, model.num_mines)
+        model.reveal_cell(8, 15)
+        heatmap.update(model)
+        play_until_over(model, (8, 15))
+        heatmap.update(model)
+        
+        model.restart()
+        probabilities = heatmap.update(model)
+        assert np.allclose(probabilities, 99 / (16 * 30))
+
+def test_matches_brute_force_on_small_boards():
+    rng = np.random.default_rng(1)
+    for seed in range(20):
+        model = GameModel((4, 4), 4, seed=seed)
+        heatmap = Heatmap(model.board_shape, model.num_mines)
+        model.reveal_cell(1, 1)
+        for _ in range(3):
+            if model.game_over:
+                break
+            np.testing.assert_allclose(heatmap.update(model), brute_force(model), atol=1e-5)
+            hidden = np.argwhere((model.user_board == -2) & ~model.flag_board)
+            row, col = hidden[rng.integers(len(hidden))]
+            if model.board[row, col] == -1:
+                model.toggle_flag(row, col)
+            else:
+                model.reveal_cell(row, col)
+
+def test_forgets_deductions_of_removed_flags():
+    rng = np.random.default_rng(2)
+    kinds = set()
+    for seed in range(200):
+        model = GameModel((4, 4), 3, seed=seed)
+        heatmap = Heatmap(model.board_shape, model.num_mines)
+        model.reveal_cell(0, 0)
+        if model.game_over:
+            continue
+        heatmap.update(model)
+        hidden = np.argwhere(model.user_board == -2)
+        row, col = hidden[rng.integers(len(hidden))]
+        kinds.add(bool(model.board[row, col] == -1))
+        for _ in range(2):
+            model.toggle_flag(row, col)
+            np.testing.assert_allclose(heatmap.update(model), brute_force(model), atol=1e-5)
+    # Both flags on mines and wrong flags were toggled off
+    assert kinds == {False, True}
+
+def brute_force(model):
+    """Return mine probabilities by checking every layout consistent with the revealed numbers and flags."""
+    rows, cols = model.board_shape
+    user = model.user_board
+    flags = model.flag_board
+    unknown = np.flatnonzero((user.ravel() == -2) & ~flags.ravel())
+    numbered = np.argwhere(user >= 0)
+    mines_left = model.num_mines - int(flags.sum())
+    counts = np.zeros(rows * cols)
+    total = 0
+    for layout in combinations(unknown.tolist(), mines_left):
+        mines = flags.copy().ravel()
+        mines[list(layout)] = True
+        mines = mines.reshape(rows, cols)
+        if all(mines[max(0, r - 1):r + 2, max(0, c - 1):c + 2].sum() == user[r, c] for r, c in numbered):
+            total += 1
+            counts += mines.ravel()
+    probabilities = np.full(rows * cols, np.nan)
+    # Flags that no layout can satisfy leave every cell unknown
+    if total:
+        probabilities[unknown] = counts[unknown] / total
+    return probabilities.reshape(rows, cols)
@@ -0,0 +1,74 @@
+import sqlite3
+import time
+import numpy as np
+from analytics import board_metrics
+from history import GameHistory
+from model import GameModel
+
+def play(history, seed, win, elapsed, board_shape=(9, 9), num_mines=10):
+    """Play one game through the history, winning or losing it on purpose, and return the model and its clicks."""
+    model = GameModel(board_shape, num_mines, seed=seed)
+    history.begin(model)
+    model.reveal_cell(0, 0)
+    history.log()
+    if win:
+        for row, col in np.argwhere((model.board != -1) & (model.user_board == -2)).tolist():
+            model.reveal_cell(row, col)
+            history.log()
+    else:
+        model.reveal_cell(*np.argwhere(model.board == -1)[0])
+        history.log()
+    assert model.game_over and model.game_won == win
+    model.final_time = elapsed
+    clicks = history.clicks
+    history.finish(model)
+    return model, clicks
+
+def test_stats_survive_reopening(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = GameHistory(path, batch_size=3, flush_interval=60)
+    results = [(seed, seed % 3 != 0, 10.0 + (seed * 7) % 13) for seed in range(10)]
+    models, clicks = zip(*(play(history, seed, win, elapsed) for seed, win, elapsed in results))
+    play(history, 99, True, 5.0, (16, 16), 40)
+    wins = [elapsed for _, win, elapsed in results if win]
+    assert history.best_time((9, 9), 10) == min(wins)
+    history.close()
+    
+    reopened = GameHistory(path)
+    assert reopened.stats == history.stats
+    assert reopened.stats[(9, 9, 10)] == [10, len(wins), min(wins)]
+    assert reopened.best_time((16, 16), 40) == 5.0
+    assert reopened.best_time((30, 30), 1) is None
+    assert [row[0] for row in reopened.best_times((9, 9), 10, limit=4)] == sorted(wins)[:4]
+    assert reopened.win_rates()[0] == (9, 9, 10, 10, len(wins), len(wins) / 10, min(wins))
+    
+    recent = reopened.recent(limit=11)
+    assert [row[4] for row in recent] == ["99"] + [str(seed) for seed in reversed(range(10))]
+    bbbv = board_metrics(np.array([model.board for model in models]))[0]
+    assert [row[8] for row in reversed(recent[1:])] == bbbv.tolist()
+    assert [row[7] for row in reversed(recent[1:])] == list(clicks)
+    reopened.close()
+
+def test_fixed_layouts_are_stored_without_a_seed(tmp_path):
+    history = GameHistory(str(tmp_path / "history.sqlite3"))
+    model = GameModel((9, 9), 10, mine_positions=np.arange(10))
+    history.begin(model)
+    model.reveal_cell(*np.argwhere(model.board == -1)[0])
+    history.finish(model)
+    history.close()
+    reopened = GameHistory(history.path)
+    assert reopened.recent()[0][4] is None
+    reopened.close()
+
+def test_batches_are_committed_after_the_flush_interval(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = GameHistory(path, batch_size=100, flush_interval=0.05)
+    play(history, 1, False, 3.0)
+    reader = sqlite3.connect(path)
+    deadline = time.monotonic() + 5
+    while reader.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert reader.execute("SELECT games, wins, best_time FROM stats").fetchall() == [(1, 0, None)]
+    reader.close()
+    history.close()
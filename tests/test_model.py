@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from model import GameModel
+
+def reference_reveal(board, user, flags, row, col):
+    """Reveal a cell by the original recursive rules, spreading from empty cells to every hidden unflagged neighbor."""
+    rows, cols = board.shape
+    if user[row, col] != -2 or flags[row, col]:
+        return
+    user[row, col] = board[row, col]
+    stack = [(row, col)] if board[row, col] == 0 else []
+    while stack:
+        r, c = stack.pop()
+        for nr in range(max(0, r - 1), min(rows, r + 2)):
+            for nc in range(max(0, c - 1), min(cols, c + 2)):
+                if user[nr, nc] == -2 and not flags[nr, nc]:
+                    user[nr, nc] = board[nr, nc]
+                    if board[nr, nc] == 0:
+                        stack.append((nr, nc))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_flood_fill_matches_recursive_rules(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = (int(size) for size in rng.integers(5, 40, 2))
+    num_mines = int(rows * cols * rng.uniform(0.02, 0.15))
+    model = GameModel((rows, cols), num_mines, seed=seed)
+    model.reveal_cell(rows // 2, cols // 2)
+    user = np.full((rows, cols), -2, dtype=np.int8)
+    flags = np.zeros((rows, cols), dtype=bool)
+    reference_reveal(model.board, user, flags, rows // 2, cols // 2)
+    
+    for _ in range(100):
+        row, col = int(rng.integers(0, rows)), int(rng.integers(0, cols))
+        # Flags, right or wrong, split empty regions; mines are never revealed so the game goes on
+        if rng.random() < 0.3 or model.board[row, col] == -1:
+            model.toggle_flag(row, col)
+            if user[row, col] == -2:
+                flags[row, col] = not flags[row, col]
+        else:
+            model.reveal_cell(row, col)
+            reference_reveal(model.board, user, flags, row, col)
+        assert np.array_equal(model.user_board, user)
+        assert np.array_equal(model.flag_board, flags)
+        assert model.unrevealed_count == np.count_nonzero(user == -2)
+
+@pytest.mark.parametrize("board_shape, num_mines", [((9, 9), 10), ((16, 30), 99), ((5, 5), 20), ((4, 4), 15)])
+def test_first_reveal_is_safe(board_shape, num_mines):
+    rng = np.random.default_rng(0)
+    rows, cols = board_shape
+    for seed in range(30):
+        row, col = int(rng.integers(0, rows)), int(rng.integers(0, cols))
+        model = GameModel(board_shape, num_mines, seed=seed)
+        assert model.board is None
+        model.reveal_cell(row, col)
+        assert np.count_nonzero(model.board == -1) == num_mines
+        assert not model.game_over or model.game_won
+        area = model.board[max(0, row - 1):row + 2, max(0, col - 1):col + 2]
+        # The neighbors are kept clear too whenever the rest of the board can hold every mine
+        if rows * cols - area.size >= num_mines:
+            assert model.board[row, col] == 0
+
+def test_seed_and_first_reveal_reproduce_the_board():
+    for seed in range(10):
+        model = GameModel((16, 30), 99, seed=seed)
+        model.reveal_cell(3, 7)
+        board = model.board.copy()
+        model.restart(seed)
+        model.reveal_cell(3, 7)
+        assert np.array_equal(model.board, board)
+        
+        again = GameModel((16, 30), 99, seed=model.seed)
+        again.reveal_cell(3, 7)
+        assert np.array_equal(again.board, board)
+        
+        model.restart()
+        model.reveal_cell(3, 7)
+        assert not np.array_equal(model.board, board)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from model import GameModel, REVEAL, FLAG, CHORD
+from replay import LAYOUT_MINES, LAYOUT_SEED, GameRecord, GameRecorder, Replay, append_game, apply_action, iter_games
+
+def record_game(model, seed, steps=150):
+    """Play seeded random actions on a model, never revealing a mine, and return the recorded game with every state."""
+    rng = np.random.default_rng(seed)
+    rows, cols = model.board_shape
+    recorder = GameRecorder()
+    recorder.begin(model)
+    states = [(model.user_board.copy(), model.flag_board.copy())]
+    
+    def act(kind, row, col):
+        """Apply and record one action, keeping the state it leaves."""
+        apply_action(model, kind, row, col)
+        recorder.log(kind, row, col)
+        states.append((model.user_board.copy(), model.flag_board.copy()))
+    
+    act(REVEAL, rows // 2, cols // 2)
+    for _ in range(steps):
+        row, col = int(rng.integers(0, rows)), int(rng.integers(0, cols))
+        kind = int(rng.choice([REVEAL, FLAG, CHORD]))
+        if kind == CHORD:
+            # Chord a revealed number once the mines around it, and only those, are flagged
+            numbers = np.argwhere(model.user_board > 0)
+            row, col = numbers[rng.integers(len(numbers))].tolist()
+            area = (slice(max(0, row - 1), row + 2), slice(max(0, col - 1), col + 2))
+            wrong = model.flag_board[area] != (model.board[area] == -1)
+            for r, c in np.argwhere(wrong & (model.user_board[area] == -2)).tolist():
+                act(FLAG, area[0].start + r, area[1].start + c)
+        elif kind == REVEAL and model.board[row, col] == -1:
+            kind = FLAG
+        act(kind, row, col)
+    return recorder.finish(), states
+
+@pytest.mark.parametrize("fixed_layout", [False, True])
+def test_encode_round_trip(fixed_layout):
+    model = GameModel((16, 30), 60, seed=3)
+    if fixed_layout:
+        model.place_mines(8, 15)
+    record, _ = record_game(model, 3)
+    assert record.layout_kind == (LAYOUT_MINES if fixed_layout else LAYOUT_SEED)
+    
+    decoded = GameRecord.decode(record.encode())
+    assert decoded.board_shape == record.board_shape
+    assert decoded.num_mines == record.num_mines
+    assert decoded.layout_kind == record.layout_kind
+    assert np.array_equal(decoded.layout, record.layout)
+    assert decoded.actions == record.actions
+    assert decoded.times == record.times
+
+def test_replay_file_holds_several_games(tmp_path):
+    path = str(tmp_path / "games.msr")
+    records = [record_game(GameModel((9, 9), 10, seed=seed), seed, steps=20)[0] for seed in range(3)]
+    for record in records:
+        append_game(path, record)
+    loaded = list(iter_games(path))
+    assert [game.encode() for game in loaded] == [record.encode() for record in records]
+    
+    with open(path, "r+b") as stream:
+        stream.write(b"XXXX")
+    with pytest.raises(ValueError):
+        list(iter_games(path))
+
+def test_seeking_matches_playing_forward():
+    record, states = record_game(GameModel((16, 30), 60, seed=5), 5)
+    replay = Replay(GameRecord.decode(record.encode()), snapshot_interval=8)
+    assert len(replay) == len(states) - 1
+    rng = np.random.default_rng(5)
+    # Forward steps, long jumps both ways and seeks past either end
+    targets = list(range(0, 20)) + rng.integers(-5, len(states) + 5, 60).tolist() + [len(states), 3, 0]
+    for index in targets:
+        model = replay.seek(index)
+        user, flags = states[max(0, min(index, len(states) - 1))]
+        assert np.array_equal(model.user_board, user), index
+        assert np.array_equal(model.flag_board, flags), index
@@ -0,0 +1,81 @@
+import asyncio
+import numpy as np
+import pytest
+from server import GameServer
+
+def apply_reply(reply, user, flags):
+    """Fold a D reply into client-side copies of the board, returning the status it reports."""
+    tokens = reply.split()
+    assert tokens[0] == "D"
+    for change in tokens[2:]:
+        cell, code = change.split("=")
+        flags.flat[int(cell)] = code == "f"
+        user.flat[int(cell)] = -2 if code in ("h", "f") else int(code)
+    return tokens[1]
+
+def test_deltas_and_board_replies_track_the_session():
+    server = GameServer()
+    rows, cols = 16, 30
+    session_id = int(server.handle_line(f"NEW {rows} {cols} 60").split()[1])
+    model = server.sessions[session_id].model
+    user = np.full((rows, cols), -2, dtype=np.int8)
+    flags = np.zeros((rows, cols), dtype=bool)
+    rng = np.random.default_rng(0)
+    
+    status = apply_reply(server.handle_line(f"ACT {session_id} r8,15"), user, flags)
+    while status == "playing":
+        cells = rng.integers(0, [rows, cols], (3, 2))
+        # Several actions of mixed kinds per line, some of them no-ops
+        tokens = [f"{'ffcr'[rng.integers(4)]}{row},{col}" for row, col in cells.tolist()]
+        status = apply_reply(server.handle_line(f"ACT {session_id} {' '.join(tokens)}"), user, flags)
+        assert np.array_equal(user, model.user_board)
+        assert np.array_equal(flags, model.flag_board)
+    assert status == ("won" if model.game_won else "lost")
+    
+    fresh_user = np.full((rows, cols), -2, dtype=np.int8)
+    fresh_flags = np.zeros((rows, cols), dtype=bool)
+    assert apply_reply(server.handle_line(f"BOARD {session_id}"), fresh_user, fresh_flags) == status
+    assert np.array_equal(fresh_user, model.user_board)
+    assert np.array_equal(fresh_flags, model.flag_board)
+    
+    assert server.handle_line(f"END {session_id}") == f"END {session_id}"
+    assert session_id not in server.sessions
+
+@pytest.mark.parametrize("line", ["", "NOPE", "NEW 0 5 1", "NEW 5 5 25", "NEW 1000 1000 10", "NEW 5 x 1",
+                                  "ACT 99 r1,1", "ACT 1 x1,1", "ACT 1 r1", "BOARD 99", "END"])
+def test_bad_commands_are_rejected(line):
+    server = GameServer()
+    server.handle_line("NEW 5 5 3")
+    with pytest.raises(ValueError):
+        server.handle_line(line)
+
+def test_session_limit_and_reaping():
+    server = GameServer(session_timeout=60, max_sessions=2)
+    first = int(server.handle_line("NEW 5 5 3").split()[1])
+    second = int(server.handle_line("NEW 5 5 3").split()[1])
+    with pytest.raises(ValueError):
+        server.handle_line("NEW 5 5 3")
+    server.sessions[first].last_used -= 61
+    assert server.reap() == 1
+    assert list(server.sessions) == [second]
+
+def test_errors_over_a_connection_keep_it_open():
+    async def exchange(lines):
+        """Send lines to an in-process server over one connection and return its replies."""
+        server = await GameServer().start("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        replies = []
+        for line in lines:
+            writer.write(line.encode() + b"\n")
+            replies.append((await reader.readline()).decode().strip())
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+    
+    replies = asyncio.run(exchange(["NEW 9 9 10", "ACT 1 q1,1", "BOARD 2", "ACT 1 f0,0", "END 1"]))
+    assert replies[0] == "NEW 1"
+    assert replies[1].startswith("ERR") and replies[2] == "ERR unknown session"
+    assert replies[3] == "D playing 0=f"
+    assert replies[4] == "END 1"
@@ -0,0 +1,95 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame as g
+import pytest
+from chunked import ChunkedGameModel
+from controller import GameController, PEEK_THRESHOLD_MS
+from model import GameModel
+from view import GameView, render_text
+
+WINDOW_SIZE = (900, 600)
+
+@pytest.fixture(scope="module")
+def screen():
+    g.init()
+    yield g.display.set_mode(WINDOW_SIZE)
+    g.quit()
+
+def make_view(screen, model, raster_min_cells=None):
+    """Create a view of the model laid out for the test window."""
+    view = GameView(screen, model)
+    if raster_min_cells is not None:
+        view.raster_min_cells = raster_min_cells
+    view.update_dimensions(*WINDOW_SIZE)
+    return view
+
+def grid_pixels(screen, view):
+    """Return a copy of the screen pixels left of the sidebar."""
+    return g.surfarray.array3d(screen)[:view.offset_x + view.grid_width].copy()
+
+def test_incremental_frames_match_full_redraw(screen):
+    model = GameModel((40, 60), 60, seed=2)
+    view = make_view(screen, model)
+    view.render()
+    # The first reveal opens most of a sparse board, a flag afterwards touches a single cell
+    moves = [lambda: model.reveal_cell(20, 30), lambda: model.toggle_flag(*np.argwhere(model.user_board == -2)[0])]
+    for move, full_grid in zip(moves, (True, False)):
+        move()
+        dirty = view.render()
+        assert (g.Rect(view.offset_x, view.offset_y, view.grid_width, view.grid_height) in dirty) == full_grid
+        incremental = grid_pixels(screen, view)
+        view.full_redraw = True
+        view.render()
+        assert np.array_equal(incremental, grid_pixels(screen, view))
+
+def render_both_ways(screen, model, controller=None):
+    """Render the model once through the raster path and once through per-tile blits, returning both grids."""
+    rows, cols = model.board_shape
+    grids = []
+    for raster_min_cells in (1, rows * cols + 1):
+        view = make_view(screen, model, raster_min_cells)
+        view.render(controller)
+        assert view.raster == (raster_min_cells == 1)
+        grids.append(grid_pixels(screen, view))
+    return grids
+
+@pytest.mark.parametrize("state", ["live", "flagged", "peeked", "game over"])
+def test_raster_matches_blits(screen, state):
+    model = GameModel((16, 30), 99, seed=5)
+    model.reveal_cell(8, 15)
+    controller = None
+    if state in ("flagged", "peeked", "game over"):
+        for row, col in np.argwhere(model.user_board == -2)[:40]:
+            model.toggle_flag(row, col)
+    if state == "peeked":
+        controller = GameController(model, None)
+        controller.peek_cell = tuple(np.argwhere(model.user_board > 0)[0])
+        controller.peeking = True
+        controller.mouse_down_time = g.time.get_ticks() - PEEK_THRESHOLD_MS - 1
+    if state == "game over":
+        model.reveal_cell(*np.argwhere((model.board == -1) & ~model.flag_board)[0])
+        assert model.game_over
+    raster, blits = render_both_ways(screen, model, controller)
+    assert np.array_equal(raster, blits)
+
+def test_per_frame_text_stays_out_of_the_label_cache(screen):
+    model = GameModel((16, 30), 99, seed=3)
+    view = make_view(screen, model)
+    view.show_overlay = True
+    model.reveal_cell(8, 15)
+    view.render()
+    cached = render_text.cache_info().currsize
+    for frame in range(20):
+        model.start_time -= 1.5
+        view.overlay_lines = [f"frame {frame}", f"{frame * 0.1:.1f} ms"]
+        view.render()
+    assert render_text.cache_info().currsize == cached
+
+def test_heatmap_stays_off_for_chunked_boards(screen):
+    model = ChunkedGameModel((100, 100), 1000, seed=1)
+    view = make_view(screen, model)
+    view.toggle_heatmap()
+    model.reveal_cell(50, 50)
+    view.render()
+    assert view.heatmap is None
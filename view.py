@@ -1,5 +1,9 @@
 import pygame as g
+import numpy as np
 import math
+from functools import lru_cache
+from model import GameModel
+from heatmap import Heatmap, HEATMAP_MAX_CELLS
 
 CELL_SIZE = 60
 GAP = 3
@@ -7,6 +11,13 @@ BORDER_RADIUS = 5
 
 SIDEBAR_WIDTH = 250
 PADDING = 30
+# Full-window redraws of at least this many cells are rasterized with numpy instead of blitted per cell
+RASTER_MIN_CELLS = 2500
+# Incremental frames that change more than this share of the visible cells redraw the whole grid instead
+FULL_REDRAW_FRACTION = 0.1
+TEXT_CACHE_SIZE = 256
+OVERLAY_FONT_SIZE = 18
+OVERLAY_LINE_HEIGHT = 16
 
 BACKGROUND_COLOR = (240, 240, 245)
 CELL_COLOR = (255, 255, 255)
@@ -23,6 +34,11 @@ BUTTON_HOVER_COLOR = (120, 170, 255)
 BUTTON_TEXT_COLOR = (255, 255, 255)
 TEXT_COLOR = (50, 50, 60)
 SUBTEXT_COLOR = (100, 100, 120)
+# Mine probability tints run from safe to certain over HEAT_LEVELS steps
+HEAT_SAFE_COLOR = (60, 200, 90)
+HEAT_MINE_COLOR = (230, 60, 50)
+HEAT_ALPHA = 120
+HEAT_LEVELS = 11
 
 NUMBER_COLORS = {
     1: (50, 120, 220),
@@ -35,6 +51,186 @@ NUMBER_COLORS = {
     8: (150, 150, 150)
 }
 
+TILE_MINE = 9
+TILE_HIDDEN = 10
+TILE_FLAG = 11
+TILE_MINE_FLAG = 12
+TILE_WRONG_FLAG = 13
+TILE_HEAT = TILE_WRONG_FLAG + 9
+TILE_COUNT = TILE_HEAT + HEAT_LEVELS
+TILE_PEEK = TILE_COUNT
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font, text, color):
+    """Render antialiased text once per font, string and color; callers must not draw on the result."""
+    return font.render(text, True, color)
+
+def live_tiles(user_values, flags, heat=None):
+    """Map user_board values and flags to atlas tile codes for a game in progress, tinting hidden cells by heat level."""
+    tiles = user_values.astype(np.intp)
+    tiles[user_values == -1] = TILE_MINE
+    tiles[user_values == -2] = TILE_HIDDEN
+    if heat is not None:
+        shaded = heat >= 0
+        tiles[shaded] = TILE_HEAT + heat[shaded]
+    tiles[flags] = TILE_FLAG
+    return tiles
+
+def heat_levels(probabilities):
+    """Quantize mine probabilities to heat levels, with -1 for cells that have none."""
+    known = np.isnan(probabilities)
+    levels = np.rint(np.where(known, 0, probabilities) * (HEAT_LEVELS - 1)).astype(np.int8)
+    levels[known] = -1
+    return levels
+
+def game_over_tiles(board_values, flags):
+    """Map board values and flags to atlas tile codes for the fully revealed board."""
+    tiles = board_values.astype(np.intp)
+    mines = board_values == -1
+    tiles[mines] = TILE_MINE
+    tiles[mines & flags] = TILE_MINE_FLAG
+    wrong = flags & ~mines
+    tiles[wrong] += TILE_WRONG_FLAG
+    return tiles
+
+class SpriteAtlas:
+    def __init__(self, cell_size):
+        """Hold one surface per tile code for the given cell size, each rendered the first time it is needed."""
+        self.cell_size = cell_size
+        self.font = None
+        # A fresh board only shows hidden tiles, so the rest are left for ensure or warm_up to build
+        self.tiles = [None] * (TILE_COUNT + TILE_PEEK)
+        self.missing = len(self.tiles)
+        self.pixels = None
+        self.pixels_format = None
+    
+    def ensure(self, codes):
+        """Render any of the given tile codes that have not been built yet."""
+        for code in codes:
+            if self.tiles[code] is None:
+                if code >= TILE_PEEK:
+                    self.ensure((code - TILE_PEEK,))
+                    self.tiles[code] = self.build_peek_tile(self.tiles[code - TILE_PEEK])
+                else:
+                    self.tiles[code] = self.build_tile(code)
+                self.missing -= 1
+    
+    def warm_up(self):
+        """Render the next tile that has not been built yet, returning whether any remain."""
+        if self.missing:
+            self.ensure((self.tiles.index(None),))
+        return self.missing > 0
+    
+    def tile_pixels(self, surface):
+        """Return every tile as one (tile, x, y) array of pixels mapped to the surface's format, built on first use."""
+        pixel_format = (surface.get_bitsize(), surface.get_masks())
+        if self.pixels is None or self.pixels_format != pixel_format:
+            self.ensure(range(len(self.tiles)))
+            self.pixels = np.stack([g.surfarray.array2d(tile.convert(surface)) for tile in self.tiles])
+            self.pixels_format = pixel_format
+        return self.pixels
+    
+    def build_tile(self, code):
+        """Render the cell square for a tile code, gap and shadow included."""
+        if code >= TILE_HEAT:
+            return self.build_heat_tile(code - TILE_HEAT)
+        cs = self.cell_size
+        surface = g.Surface((cs, cs))
+        surface.fill(BACKGROUND_COLOR)
+        
+        cell_width = cs - GAP * 2
+        cell_height = cs - GAP * 2
+        value = code - TILE_WRONG_FLAG if code >= TILE_WRONG_FLAG else code
+        
+        if code in (TILE_HIDDEN, TILE_FLAG):
+            cell_color = UNREVEALED_CELL_COLOR
+        elif value == 0:
+            cell_color = EMPTY_CELL_COLOR
+        else:
+            cell_color = CELL_COLOR
+        
+        g.draw.rect(surface, SHADOW_COLOR, (GAP + 2, GAP + 2, cell_width, cell_height), border_radius=BORDER_RADIUS)
+        g.draw.rect(surface, cell_color, (GAP, GAP, cell_width, cell_height), border_radius=BORDER_RADIUS)
+        
+        if code in (TILE_MINE, TILE_MINE_FLAG):
+            self.draw_mine(surface, GAP, GAP, cell_width, cell_height)
+        elif 0 < value <= 8:
+            if self.font is None:
+                self.font = g.font.Font(None, max(10, int(cs * 0.55)))
+                self.font.set_bold(True)
+            color = NUMBER_COLORS.get(value, TEXT_COLOR)
+            text = self.font.render(str(value), True, color)
+            surface.blit(text, text.get_rect(center=(GAP + cell_width // 2, GAP + cell_height // 2)))
+        
+        if code in (TILE_FLAG, TILE_MINE_FLAG):
+            self.draw_flag(surface, GAP, GAP, cell_width, cell_height)
+        elif code >= TILE_WRONG_FLAG:
+            x, y = GAP, GAP
+            g.draw.line(surface, INCORRECT_FLAG_COLOR, (x + 5, y + 5), 
+                       (x + cell_width - 5, y + cell_height - 5), 3)
+            g.draw.line(surface, INCORRECT_FLAG_COLOR, (x + cell_width - 5, y + 5), 
+                       (x + 5, y + cell_height - 5), 3)
+        return surface
+    
+    def build_peek_tile(self, tile):
+        """Return a copy of a tile with the peek highlight composited on top."""
+        cell_width = self.cell_size - GAP * 2
+        cell_height = self.cell_size - GAP * 2
+        surface = tile.copy()
+        overlay = g.Surface((cell_width, cell_height), g.SRCALPHA)
+        overlay.fill((*PEEK_HIGHLIGHT_COLOR, 100))
+        surface.blit(overlay, (GAP, GAP))
+        g.draw.rect(surface, PEEK_HIGHLIGHT_COLOR, (GAP, GAP, cell_width, cell_height), width=2, border_radius=BORDER_RADIUS)
+        return surface
+    
+    def build_heat_tile(self, level):
+        """Return a hidden tile tinted between the safe and mine colors for a heat level."""
+        cell_width = self.cell_size - GAP * 2
+        cell_height = self.cell_size - GAP * 2
+        t = level / (HEAT_LEVELS - 1)
+        color = tuple(round(a + (b - a) * t) for a, b in zip(HEAT_SAFE_COLOR, HEAT_MINE_COLOR))
+        surface = self.build_tile(TILE_HIDDEN)
+        overlay = g.Surface((cell_width, cell_height), g.SRCALPHA)
+        g.draw.rect(overlay, (*color, HEAT_ALPHA), (0, 0, cell_width, cell_height), border_radius=BORDER_RADIUS)
+        surface.blit(overlay, (GAP, GAP))
+        return surface
+    
+    def draw_flag(self, surface, x, y, width, height):
+        """Draw a flag icon."""
+        center_x = x + width // 2
+        center_y = y + height // 2
+        flag_height = int(height * 0.5)
+        flag_width = int(width * 0.4)
+        
+        pole_x = center_x - flag_width // 3
+        pole_top = center_y - flag_height // 2
+        pole_bottom = center_y + flag_height // 2 + 3
+        
+        g.draw.line(surface, FLAG_POLE_COLOR, (pole_x, pole_top), (pole_x, pole_bottom), 2)
+        
+        flag_points = [
+            (pole_x, pole_top),
+            (pole_x + flag_width, pole_top + flag_height // 3),
+            (pole_x, pole_top + flag_height * 2 // 3)
+        ]
+        g.draw.polygon(surface, FLAG_COLOR, flag_points)
+    
+    def draw_mine(self, surface, x, y, width, height):
+        """Draw a mine icon."""
+        center_x = x + width // 2
+        center_y = y + height // 2
+        mine_radius = max(8, int(width * 0.3))
+        
+        g.draw.circle(surface, MINE_COLOR, (center_x, center_y), mine_radius)
+        
+        for angle in [0, 45, 90, 135]:
+            rad = math.radians(angle)
+            x1 = center_x + int(math.cos(rad) * mine_radius * 1.4)
+            y1 = center_y + int(math.sin(rad) * mine_radius * 1.4)
+            x2 = center_x - int(math.cos(rad) * mine_radius * 1.4)
+            y2 = center_y - int(math.sin(rad) * mine_radius * 1.4)
+            g.draw.line(surface, MINE_COLOR, (x1, y1), (x2, y2), 2)
+
 class GameView:
     def __init__(self, screen, model):
         """Initialize the game view with screen and model references."""
@@ -52,12 +248,45 @@ class GameView:
         self.offset_x = PADDING
         self.offset_y = (self.screen_height - self.grid_height) // 2
         
-        self.font = None
+        # Top-left cell and size of the part of the board that fits in the window
+        self.view_row = 0
+        self.view_col = 0
+        self.visible_rows = rows
+        self.visible_cols = cols
+        self.raster_min_cells = RASTER_MIN_CELLS
+        self.raster = False
+        
+        self.atlas = None
         self.title_font = None
         self.button_font = None
+        self.peek_cell = None
         self.peek_neighbors = None
         self.restart_rect = None
         self.exit_rect = None
+        self.game_over_frame = None
+        self.game_over_key = None
+        
+        # Smallest step of the running sidebar timer in seconds; whole seconds drop the centiseconds
+        self.timer_resolution = 0.01
+        
+        # Performance overlay text set by a FrameProfiler while show_overlay is on
+        self.show_overlay = False
+        self.overlay_lines = None
+        self.overlay_font = None
+        # Mine probability hint toggled with H; None while hidden
+        self.heatmap = None
+        # GameHistory whose cached personal bests the sidebar shows, if games are being kept
+        self.history = None
+        
+        self.full_redraw = True
+        self.shown_revision = None
+        self.shown_user = None
+        self.shown_flags = None
+        self.shown_heat = None
+        self.shown_peek = frozenset()
+        self.shown_game_over = None
+        self.shown_labels = {}
+        self.shown_buttons = None
     
     def update_dimensions(self, new_width, new_height):
         """Update view dimensions and scale cell size when window is resized."""
@@ -71,146 +300,231 @@ class GameView:
         
         if new_cell_size != self.cell_size:
             self.cell_size = new_cell_size
-            self.font = None
+            self.atlas = None
             self.title_font = None
             self.button_font = None
         
-        self.grid_width = cols * self.cell_size
-        self.grid_height = rows * self.cell_size
+        # Boards that do not fit at the minimum cell size are shown through a scrollable viewport
+        self.visible_rows = max(1, min(rows, available_h // self.cell_size))
+        self.visible_cols = max(1, min(cols, available_w // self.cell_size))
+        self.grid_width = self.visible_cols * self.cell_size
+        self.grid_height = self.visible_rows * self.cell_size
         self.offset_x = PADDING + max(0, (available_w - self.grid_width) // 2)
         self.offset_y = PADDING + max(0, (available_h - self.grid_height) // 2)
+        # Direct pixel access needs 8, 16 or 32 bits per pixel and the whole grid on the screen surface
+        screen_width, screen_height = self.screen.get_size()
+        self.raster = (self.visible_rows * self.visible_cols >= self.raster_min_cells and self.screen.get_bytesize() != 3
+                       and self.offset_x + self.grid_width <= screen_width and self.offset_y + self.grid_height <= screen_height)
+        self.scroll_to(self.view_row, self.view_col)
+        self.game_over_frame = None
+        self.full_redraw = True
     
-    def draw_flag(self, x, y, width, height):
-        """Draw a flag icon."""
-        center_x = x + width // 2
-        center_y = y + height // 2
-        flag_height = int(height * 0.5)
-        flag_width = int(width * 0.4)
-        
-        pole_x = center_x - flag_width // 3
-        pole_top = center_y - flag_height // 2
-        pole_bottom = center_y + flag_height // 2 + 3
-        
-        g.draw.line(self.screen, FLAG_POLE_COLOR, (pole_x, pole_top), (pole_x, pole_bottom), 2)
+    def scroll_to(self, row, col):
+        """Move the viewport so the given cell is its top-left corner, clamped to the board."""
+        rows, cols = self.model.board_shape
+        row = max(0, min(row, rows - self.visible_rows))
+        col = max(0, min(col, cols - self.visible_cols))
+        if (row, col) != (self.view_row, self.view_col):
+            self.view_row = row
+            self.view_col = col
+            self.full_redraw = True
+    
+    def scroll_by(self, rows, cols):
+        """Move the viewport by a number of cells."""
+        self.scroll_to(self.view_row + rows, self.view_col + cols)
+    
+    def visible_slices(self):
+        """Return the row and column slices of the board inside the viewport."""
+        return (slice(self.view_row, self.view_row + self.visible_rows),
+                slice(self.view_col, self.view_col + self.visible_cols))
+    
+    def cell_at(self, x, y):
+        """Return the (row, col) of the board cell under a screen position, or None."""
+        col = (x - self.offset_x) // self.cell_size
+        row = (y - self.offset_y) // self.cell_size
+        if 0 <= row < self.visible_rows and 0 <= col < self.visible_cols:
+            return row + self.view_row, col + self.view_col
+        return None
+    
+    def ensure_atlas(self):
+        """Build the sprite atlas for the current cell size if needed."""
+        if self.atlas is None or self.atlas.cell_size != self.cell_size:
+            self.atlas = SpriteAtlas(self.cell_size)
+    
+    def warm_up(self):
+        """Build one deferred sprite for the current cell size, returning whether any remain."""
+        self.ensure_atlas()
+        return self.atlas.warm_up()
+    
+    def cell_rect(self, row, col):
+        """Return the screen square owned by a cell, including its gap and shadow."""
+        cs = self.cell_size
+        return g.Rect(self.offset_x + (col - self.view_col) * cs, self.offset_y + (row - self.view_row) * cs, cs, cs)
+    
+    def blit_tiles(self, rows, cols, tiles):
+        """Blit the atlas tiles for the given viewport cells in a single batch."""
+        if self.raster and len(tiles) == self.visible_rows * self.visible_cols:
+            grid = np.empty((self.visible_rows, self.visible_cols), dtype=np.intp)
+            grid[rows, cols] = tiles
+            self.raster_tiles(grid)
+            return
+        cs = self.cell_size
+        if self.atlas.missing:
+            self.atlas.ensure(np.unique(tiles).tolist())
+        sprites = self.atlas.tiles
+        xs = (self.offset_x + cols * cs).tolist()
+        ys = (self.offset_y + rows * cs).tolist()
+        self.screen.blits([(sprites[tile], (x, y)) for tile, x, y in zip(tiles.tolist(), xs, ys)], doreturn=False)
+    
+    def raster_tiles(self, grid):
+        """Copy a whole viewport of tile codes straight from the atlas pixels into the screen with numpy."""
+        cs = self.cell_size
+        rows, cols = grid.shape
+        pixels = self.atlas.tile_pixels(self.screen)
+        target = g.surfarray.pixels2d(self.screen)
+        # Surface arrays are indexed x first; splitting the window into (col, x, row, y) lets every tile land in place
+        window = target[self.offset_x:self.offset_x + cols * cs, self.offset_y:self.offset_y + rows * cs]
+        window.reshape(cols, cs, rows, cs)[...] = pixels[grid.T].transpose(0, 2, 1, 3)
+        # Release the surface lock held by the pixel array
+        del window, target
+    
+    def draw_cells(self, rows, cols):
+        """Draw the given viewport cells of the live game, highlighting any that are being peeked."""
+        heat = self.shown_heat[rows, cols] if self.shown_heat is not None else None
+        tiles = live_tiles(self.shown_user[rows, cols], self.shown_flags[rows, cols], heat)
+        if self.shown_peek:
+            width = self.visible_cols
+            peek = [(row - self.view_row) * width + col - self.view_col for row, col in self.shown_peek]
+            tiles[np.isin(rows * width + cols, peek)] += TILE_PEEK
+        self.blit_tiles(rows, cols, tiles)
+    
+    def visible_heat(self):
+        """Return the heat level of every viewport cell, bringing the heatmap up to date first."""
+        return heat_levels(self.heatmap.update(self.model)[self.visible_slices()])
+    
+    def visible_peek(self):
+        """Return the peeked cells that lie inside the viewport."""
+        if not self.peek_neighbors:
+            return frozenset()
+        rows, cols = self.visible_slices()
+        return frozenset((row, col) for row, col in self.peek_neighbors
+                         if rows.start <= row < rows.stop and cols.start <= col < cols.stop)
+    
+    def changed_cells(self):
+        """Return a viewport mask of the cells whose value, flag or peek highlight changed since they were last drawn."""
+        changed = np.zeros(self.shown_user.shape, dtype=bool)
+        peek = self.visible_peek()
+        for row, col in peek ^ self.shown_peek:
+            changed[row - self.view_row, col - self.view_col] = True
+        self.shown_peek = peek
         
-        flag_points = [
-            (pole_x, pole_top),
-            (pole_x + flag_width, pole_top + flag_height // 3),
-            (pole_x, pole_top + flag_height * 2 // 3)
-        ]
-        g.draw.polygon(self.screen, FLAG_COLOR, flag_points)
+        if self.model.revision != self.shown_revision:
+            rows, cols = self.visible_slices()
+            user = self.model.user_board[rows, cols]
+            flags = self.model.flag_board[rows, cols]
+            changed |= (user != self.shown_user) | (flags != self.shown_flags)
+            if self.shown_heat is not None:
+                # A move can shift the odds of hidden cells far from the cells it changed
+                heat = self.visible_heat()
+                changed |= heat != self.shown_heat
+                np.copyto(self.shown_heat, heat)
+            np.copyto(self.shown_user, user)
+            np.copyto(self.shown_flags, flags)
+            self.shown_revision = self.model.revision
+        return changed
     
-    def draw_mine(self, x, y, width, height):
-        """Draw a mine icon."""
-        center_x = x + width // 2
-        center_y = y + height // 2
-        mine_radius = max(8, int(width * 0.3))
+    def draw_grid(self, full=True):
+        """Draw the visible grid and sidebar, or only what changed when full is False, and return the dirty rects."""
+        self.ensure_atlas()
         
-        g.draw.circle(self.screen, MINE_COLOR, (center_x, center_y), mine_radius)
+        if full or self.shown_user is None or self.shown_user.shape != (self.visible_rows, self.visible_cols):
+            rows, cols = self.visible_slices()
+            self.shown_user = np.array(self.model.user_board[rows, cols])
+            self.shown_flags = np.array(self.model.flag_board[rows, cols])
+            self.shown_heat = self.visible_heat() if self.heatmap else None
+            self.shown_revision = self.model.revision
+            self.shown_peek = self.visible_peek()
+            rows, cols = np.indices(self.shown_user.shape).reshape(2, -1)
+            self.draw_cells(rows, cols)
+            dirty = []
+        else:
+            changed = self.changed_cells()
+            count = np.count_nonzero(changed)
+            if count > changed.size * FULL_REDRAW_FRACTION:
+                # Past this point one pass over the grid and a single rect beat per-cell blits and rects
+                rows, cols = np.indices(changed.shape).reshape(2, -1)
+                self.draw_cells(rows, cols)
+                dirty = [g.Rect(self.offset_x, self.offset_y, self.grid_width, self.grid_height)]
+            elif count:
+                rows, cols = np.nonzero(changed)
+                self.draw_cells(rows, cols)
+                cs = self.cell_size
+                dirty = [g.Rect(x, y, cs, cs) for x, y in zip((self.offset_x + cols * cs).tolist(), (self.offset_y + rows * cs).tolist())]
+            else:
+                dirty = []
         
-        for angle in [0, 45, 90, 135]:
-            rad = math.radians(angle)
-            x1 = center_x + int(math.cos(rad) * mine_radius * 1.4)
-            y1 = center_y + int(math.sin(rad) * mine_radius * 1.4)
-            x2 = center_x - int(math.cos(rad) * mine_radius * 1.4)
-            y2 = center_y - int(math.sin(rad) * mine_radius * 1.4)
-            g.draw.line(self.screen, MINE_COLOR, (x1, y1), (x2, y2), 2)
-    
-    def draw_grid(self):
-        """Draw the game grid with cells, numbers, and flags."""
-        cs = self.cell_size
-        if self.font is None:
-            font_size = max(10, int(cs * 0.55))
-            self.font = g.font.Font(None, font_size)
-            self.font.set_bold(True)
-        
-        for row in range(self.model.board_shape[0]):
-            for col in range(self.model.board_shape[1]):
-                x = self.offset_x + col * cs + GAP
-                y = self.offset_y + row * cs + GAP
-                cell_width = cs - GAP * 2
-                cell_height = cs - GAP * 2
-                user_value = self.model.user_board[row, col]
-                
-                is_highlighted = self.peek_neighbors and (row, col) in self.peek_neighbors
-                
-                if user_value == -2:
-                    cell_color = UNREVEALED_CELL_COLOR
-                elif user_value == 0:
-                    cell_color = EMPTY_CELL_COLOR
-                else:
-                    cell_color = CELL_COLOR
-                
-                g.draw.rect(self.screen, SHADOW_COLOR, (x + 2, y + 2, cell_width, cell_height), border_radius=BORDER_RADIUS)
-                g.draw.rect(self.screen, cell_color, (x, y, cell_width, cell_height), border_radius=BORDER_RADIUS)
-                
-                if user_value == -1:
-                    self.draw_mine(x, y, cell_width, cell_height)
-                elif user_value > 0:
-                    color = NUMBER_COLORS.get(int(user_value), TEXT_COLOR)
-                    text = self.font.render(str(int(user_value)), True, color)
-                    text_rect = text.get_rect(center=(x + cell_width // 2, y + cell_height // 2))
-                    self.screen.blit(text, text_rect)
-                
-                if self.model.flag_board[row, col]:
-                    self.draw_flag(x, y, cell_width, cell_height)
-                
-                if is_highlighted:
-                    overlay = g.Surface((cell_width, cell_height), g.SRCALPHA)
-                    overlay.fill((*PEEK_HIGHLIGHT_COLOR, 100))
-                    self.screen.blit(overlay, (x, y))
-                    g.draw.rect(self.screen, PEEK_HIGHLIGHT_COLOR, (x, y, cell_width, cell_height), width=2, border_radius=BORDER_RADIUS)
-        
-        self.draw_sidebar()
+        dirty.extend(self.draw_sidebar())
+        return dirty
     
     def draw_game_over_grid(self):
-        """Draw the game grid when game is over, revealing all cells."""
-        cs = self.cell_size
-        if self.font is None:
-            font_size = max(10, int(cs * 0.55))
-            self.font = g.font.Font(None, font_size)
-            self.font.set_bold(True)
-        
-        for row in range(self.model.board_shape[0]):
-            for col in range(self.model.board_shape[1]):
-                x = self.offset_x + col * cs + GAP
-                y = self.offset_y + row * cs + GAP
-                cell_width = cs - GAP * 2
-                cell_height = cs - GAP * 2
-                cell_value = self.model.board[row, col]
-                
-                if cell_value == 0:
-                    cell_color = EMPTY_CELL_COLOR
-                else:
-                    cell_color = CELL_COLOR
-                
-                g.draw.rect(self.screen, SHADOW_COLOR, (x + 2, y + 2, cell_width, cell_height), border_radius=BORDER_RADIUS)
-                g.draw.rect(self.screen, cell_color, (x, y, cell_width, cell_height), border_radius=BORDER_RADIUS)
-                
-                if cell_value == -1:
-                    self.draw_mine(x, y, cell_width, cell_height)
-                elif cell_value > 0:
-                    color = NUMBER_COLORS.get(int(cell_value), TEXT_COLOR)
-                    text = self.font.render(str(int(cell_value)), True, color)
-                    text_rect = text.get_rect(center=(x + cell_width // 2, y + cell_height // 2))
-                    self.screen.blit(text, text_rect)
-                
-                if self.model.flag_board[row, col]:
-                    if cell_value == -1:
-                        self.draw_flag(x, y, cell_width, cell_height)
-                    else:
-                        g.draw.line(self.screen, INCORRECT_FLAG_COLOR, (x + 5, y + 5), 
-                                   (x + cell_width - 5, y + cell_height - 5), 3)
-                        g.draw.line(self.screen, INCORRECT_FLAG_COLOR, (x + cell_width - 5, y + 5), 
-                                   (x + 5, y + cell_height - 5), 3)
+        """Draw the visible grid when game is over, revealing all cells."""
+        # The final board only changes with a new game (which bumps the revision), scrolling or a resize
+        key = (self.model.revision, self.view_row, self.view_col, self.visible_rows, self.visible_cols, self.cell_size)
+        rect = g.Rect(self.offset_x, self.offset_y, self.grid_width, self.grid_height)
+        if self.game_over_frame is not None and self.game_over_key == key:
+            self.screen.blit(self.game_over_frame, rect)
+            return
+        
+        self.ensure_atlas()
+        rows, cols = self.visible_slices()
+        board = np.asarray(self.model.board[rows, cols])
+        flags = np.asarray(self.model.flag_board[rows, cols])
+        rows, cols = np.indices(board.shape).reshape(2, -1)
+        self.blit_tiles(rows, cols, game_over_tiles(board.ravel(), flags.ravel()))
+        self.game_over_frame = self.screen.subsurface(rect.clip(self.screen.get_rect())).copy()
+        self.game_over_key = key
     
     def _sidebar_center_x(self):
         """Return the horizontal center of the sidebar area."""
         sidebar_start = self.offset_x + self.grid_width + PADDING
         return sidebar_start + max(0, self.screen_width - sidebar_start - PADDING) // 2
     
+    def draw_label(self, key, text, font, color, center, cached=True):
+        """Blit a text label unless it is unchanged since the last frame, and return the dirty rects."""
+        shown = self.shown_labels.get(key)
+        if shown is not None and shown[0] == text and shown[1] == color:
+            return []
+        
+        # Strings that change every frame would only push the static labels out of the shared cache
+        surface = render_text(font, text, color) if cached else font.render(text, True, color)
+        rect = surface.get_rect(center=center)
+        dirty = [rect]
+        if shown is not None:
+            self.screen.fill(BACKGROUND_COLOR, shown[2])
+            dirty.append(shown[2])
+        self.screen.blit(surface, rect)
+        self.shown_labels[key] = (text, color, rect)
+        return dirty
+    
+    def format_time(self, elapsed, centiseconds=True, label="Time"):
+        """Format an elapsed time in seconds as the sidebar timer text."""
+        minutes = int(elapsed // 60)
+        seconds = int(elapsed % 60)
+        if not centiseconds:
+            return f"{label}: {minutes:02d}:{seconds:02d}"
+        centiseconds = int((elapsed * 100) % 100)
+        return f"{label}: {minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+    
+    def draw_best_time(self, center):
+        """Draw the personal best for the board configuration from the history's cached stats, returning the rects that changed."""
+        if self.history is None:
+            return []
+        best = self.history.best_time(self.model.board_shape, self.model.num_mines)
+        text = self.format_time(best, label="Best") if best is not None else "Best: --:--"
+        return self.draw_label("best", text, self.button_font, SUBTEXT_COLOR, center)
+    
     def draw_sidebar(self):
-        """Draw the sidebar with stats and info."""
+        """Draw the sidebar with stats and info, returning the rects of labels that changed."""
         sidebar_start = self.offset_x + self.grid_width + PADDING
         sidebar_w = max(1, self.screen_width - sidebar_start - PADDING)
         cx = sidebar_start + sidebar_w // 2
@@ -223,25 +537,48 @@ class GameView:
         
         grid_mid_y = self.offset_y + self.grid_height // 2
         
-        title_text = self.title_font.render("MINESWEEPER", True, TEXT_COLOR)
-        title_rect = title_text.get_rect(center=(cx, self.offset_y + 20))
-        self.screen.blit(title_text, title_rect)
+        dirty = self.draw_label("title", "MINESWEEPER", self.title_font, TEXT_COLOR, (cx, self.offset_y + 20))
         
         flag_count = self.model.get_flag_count()
-        flag_text = self.button_font.render(f"Flags: {flag_count}/{self.model.num_mines}", True, TEXT_COLOR)
-        flag_rect = flag_text.get_rect(center=(cx, grid_mid_y - 20))
-        self.screen.blit(flag_text, flag_rect)
+        dirty += self.draw_label("flags", f"Flags: {flag_count}/{self.model.num_mines}", self.button_font, TEXT_COLOR, (cx, grid_mid_y - 20))
         
-        elapsed = self.model.get_elapsed_time()
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-        centiseconds = int((elapsed * 100) % 100)
-        timer_text = self.button_font.render(f"Time: {minutes:02d}:{seconds:02d}.{centiseconds:02d}", True, TEXT_COLOR)
-        timer_rect = timer_text.get_rect(center=(cx, grid_mid_y + 25))
-        self.screen.blit(timer_text, timer_rect)
+        timer = self.format_time(self.model.get_elapsed_time(), self.timer_resolution < 1)
+        dirty += self.draw_label("timer", timer, self.button_font, TEXT_COLOR, (cx, grid_mid_y + 25), cached=False)
+        dirty += self.draw_best_time((cx, grid_mid_y + 60))
+        return dirty + self.draw_overlay(cx)
+    
+    def draw_overlay(self, cx):
+        """Draw the performance overlay at the bottom of the sidebar, returning the rects that changed."""
+        if not self.show_overlay or not self.overlay_lines:
+            return []
+        if self.overlay_font is None:
+            self.overlay_font = g.font.Font(None, OVERLAY_FONT_SIZE)
+        
+        dirty = []
+        top = self.screen_height - PADDING - len(self.overlay_lines) * OVERLAY_LINE_HEIGHT
+        for i, line in enumerate(self.overlay_lines):
+            center = (cx, top + i * OVERLAY_LINE_HEIGHT + OVERLAY_LINE_HEIGHT // 2)
+            dirty += self.draw_label(f"overlay{i}", line, self.overlay_font, SUBTEXT_COLOR, center, cached=False)
+        return dirty
+    
+    def toggle_overlay(self):
+        """Show or hide the performance overlay."""
+        self.show_overlay = not self.show_overlay
+        self.overlay_lines = None
+        self.full_redraw = True
+    
+    def toggle_heatmap(self):
+        """Show or hide the mine probability tint on hidden cells, on dense boards small enough to track it."""
+        rows, cols = self.model.board_shape
+        # Chunked boards expose their cells as windowed layers, not the whole arrays the heatmap reads
+        if self.heatmap is None and isinstance(self.model, GameModel) and rows * cols <= HEATMAP_MAX_CELLS:
+            self.heatmap = Heatmap(self.model.board_shape, self.model.num_mines)
+        else:
+            self.heatmap = None
+        self.full_redraw = True
     
     def draw_game_over_ui(self):
-        """Draw the game over UI in the sidebar and store button rects."""
+        """Draw the game over UI in the sidebar, store button rects and return the dirty rects."""
         sidebar_start = self.offset_x + self.grid_width + PADDING
         sidebar_w = max(1, self.screen_width - sidebar_start - PADDING)
         cx = sidebar_start + sidebar_w // 2
@@ -255,19 +592,14 @@ class GameView:
         grid_mid_y = self.offset_y + self.grid_height // 2
         
         if self.model.game_won:
-            status_text = self.title_font.render("YOU WIN!", True, (50, 200, 50))
+            dirty = self.draw_label("status", "YOU WIN!", self.title_font, (50, 200, 50), (cx, grid_mid_y - 70))
         else:
-            status_text = self.title_font.render("GAME OVER", True, (220, 50, 50))
-        status_rect = status_text.get_rect(center=(cx, grid_mid_y - 70))
-        self.screen.blit(status_text, status_rect)
+            dirty = self.draw_label("status", "GAME OVER", self.title_font, (220, 50, 50), (cx, grid_mid_y - 70))
         
-        elapsed = self.model.get_elapsed_time()
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-        centiseconds = int((elapsed * 100) % 100)
-        timer_text = self.button_font.render(f"Time: {minutes:02d}:{seconds:02d}.{centiseconds:02d}", True, TEXT_COLOR)
-        timer_rect = timer_text.get_rect(center=(cx, grid_mid_y))
-        self.screen.blit(timer_text, timer_rect)
+        timer = self.format_time(self.model.get_elapsed_time())
+        dirty += self.draw_label("timer", timer, self.button_font, TEXT_COLOR, (cx, grid_mid_y), cached=False)
+        dirty += self.draw_best_time((cx, grid_mid_y - 30))
+        dirty += self.draw_overlay(cx)
         
         button_width = min(180, sidebar_w - PADDING)
         button_height = max(35, min(50, self.screen_height // 14))
@@ -279,29 +611,50 @@ class GameView:
         restart_hover = button_x <= mouse_pos[0] <= button_x + button_width and restart_button_y <= mouse_pos[1] <= restart_button_y + button_height
         exit_hover = button_x <= mouse_pos[0] <= button_x + button_width and exit_button_y <= mouse_pos[1] <= exit_button_y + button_height
         
-        g.draw.rect(self.screen, BUTTON_HOVER_COLOR if restart_hover else BUTTON_COLOR, (button_x, restart_button_y, button_width, button_height), border_radius=8)
-        g.draw.rect(self.screen, BUTTON_HOVER_COLOR if exit_hover else BUTTON_COLOR, (button_x, exit_button_y, button_width, button_height), border_radius=8)
+        self.restart_rect = (button_x, restart_button_y, button_width, button_height)
+        self.exit_rect = (button_x, exit_button_y, button_width, button_height)
+        
+        buttons = (self.restart_rect, self.exit_rect, restart_hover, exit_hover)
+        if buttons == self.shown_buttons:
+            return dirty
+        self.shown_buttons = buttons
+        
+        for rect in (self.restart_rect, self.exit_rect):
+            self.screen.fill(BACKGROUND_COLOR, rect)
+        g.draw.rect(self.screen, BUTTON_HOVER_COLOR if restart_hover else BUTTON_COLOR, self.restart_rect, border_radius=8)
+        g.draw.rect(self.screen, BUTTON_HOVER_COLOR if exit_hover else BUTTON_COLOR, self.exit_rect, border_radius=8)
         
-        restart_text = self.button_font.render("Restart", True, BUTTON_TEXT_COLOR)
-        exit_text = self.button_font.render("Exit", True, BUTTON_TEXT_COLOR)
+        restart_text = render_text(self.button_font, "Restart", BUTTON_TEXT_COLOR)
+        exit_text = render_text(self.button_font, "Exit", BUTTON_TEXT_COLOR)
         self.screen.blit(restart_text, restart_text.get_rect(center=(button_x + button_width // 2, restart_button_y + button_height // 2)))
         self.screen.blit(exit_text, exit_text.get_rect(center=(button_x + button_width // 2, exit_button_y + button_height // 2)))
         
-        self.restart_rect = (button_x, restart_button_y, button_width, button_height)
-        self.exit_rect = (button_x, exit_button_y, button_width, button_height)
+        dirty.extend(g.Rect(rect) for rect in (self.restart_rect, self.exit_rect))
+        return dirty
     
     def render(self, controller=None):
-        """Render the game view, including grid and UI elements."""
-        self.screen.fill(BACKGROUND_COLOR)
+        """Redraw what changed since the last frame and return the dirty rects for display.update."""
+        peek_cell = controller.peek_cell if controller and controller.is_peek_active() else None
+        if peek_cell != self.peek_cell:
+            # The neighbor set only changes with the peeked cell, not on every peeking frame
+            self.peek_cell = peek_cell
+            self.peek_neighbors = set(self.model.get_neighbors(*peek_cell)) if peek_cell else None
         
-        if controller and controller.is_peek_active() and controller.peek_cell:
-            row, col = controller.peek_cell
-            self.peek_neighbors = self.model.get_neighbors(row, col)
-        else:
-            self.peek_neighbors = None
+        full = self.full_redraw or self.model.game_over != self.shown_game_over
+        if full:
+            self.screen.fill(BACKGROUND_COLOR)
+            self.shown_labels = {}
+            self.shown_buttons = None
+            self.full_redraw = False
+            self.shown_game_over = self.model.game_over
         
         if self.model.game_over:
-            self.draw_game_over_grid()
-            self.draw_game_over_ui()
+            if full:
+                self.draw_game_over_grid()
+            dirty = self.draw_game_over_ui()
         else:
-            self.draw_grid()
+            dirty = self.draw_grid(full)
+        
+        if full:
+            return [self.screen.get_rect()]
+        return dirty